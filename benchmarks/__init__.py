@@ -0,0 +1,6 @@
+"""Воспроизводимые бенчмарки представлений блога на засеянной базе.
+
+Запуск из корня репозитория::
+
+    python -m benchmarks --posts 100000 --comments 1000000 --output run.json
+"""
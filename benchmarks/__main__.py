@@ -0,0 +1,95 @@
+import argparse
+import json
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.environment import setup_django
+from benchmarks.runner import format_row, run
+from benchmarks.seed import seed
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Бенчмарк представлений блога на засеянной базе.',
+    )
+    parser.add_argument('--db', type=Path,
+                        help='Файл базы; по умолчанию временный.')
+    parser.add_argument('--reuse', action='store_true',
+                        help='Не засевать базу, если файл уже есть.')
+    parser.add_argument('--settings', default='blogicum.settings')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--locations', type=int, default=100)
+    parser.add_argument('--posts', type=int, default=10_000)
+    parser.add_argument('--comments', type=int, default=50_000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=200,
+                        help='Запросов на каждое представление.')
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--max-page', type=int, default=50)
+    parser.add_argument('--anonymous', action='store_true',
+                        help='Читать ленты без авторизации (через кеш).')
+    parser.add_argument('--only', nargs='*',
+                        help='Запустить только указанные представления.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path,
+                        help='Куда сохранить результаты в JSON.')
+    parser.add_argument('--baseline', type=Path,
+                        help='JSON прошлого запуска для сравнения.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = None
+    if args.db is None:
+        workdir = tempfile.TemporaryDirectory(prefix='blogicum-bench-')
+        args.db = Path(workdir.name) / 'bench.sqlite3'
+    existed = args.db.exists()
+
+    setup_django(args.db, args.settings)
+    dataset = {
+        'users': args.users,
+        'categories': args.categories,
+        'locations': args.locations,
+        'posts': args.posts,
+        'comments': args.comments,
+    }
+    if not (existed and args.reuse):
+        seed(**dataset, batch_size=args.batch_size, random_seed=args.seed)
+
+    results = run(
+        args.requests, warmup=args.warmup, max_page=args.max_page,
+        anonymous=args.anonymous, random_seed=args.seed, only=args.only,
+    )
+    report = {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'settings': args.settings,
+            'anonymous': args.anonymous,
+            'python': platform.python_version(),
+            'dataset': dataset,
+            'requests': args.requests,
+        },
+        'results': results,
+    }
+    if args.output:
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2)
+        )
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())['results']
+        print('\nСравнение с базой:')
+        for name, result in results.items():
+            if name in baseline:
+                print(format_row(name, result, baseline[name]))
+    if workdir:
+        workdir.cleanup()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
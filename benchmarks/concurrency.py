@@ -0,0 +1,173 @@
+"""Конкурентный бенчмарк: читатели лент и авторы комментариев одновременно.
+
+Каждый читатель и писатель работает в отдельном процессе со своим
+соединением SQLite. Сценарий прогоняется дважды: с журналом отката
+(как было до настройки SQLITE_PRAGMAS) и с прагмами из настроек::
+
+    python -m benchmarks.concurrency --readers 4 --writers 2 --duration 10
+"""
+import argparse
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.environment import setup_django
+from benchmarks.runner import make_client, percentile
+from benchmarks.seed import seed
+
+ROLLBACK_PRAGMAS = {'journal_mode': 'delete'}
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.concurrency',
+        description='Пропускная способность при смешанной нагрузке.',
+    )
+    parser.add_argument('--db', type=Path,
+                        help='Файл базы; по умолчанию временный.')
+    parser.add_argument('--reuse', action='store_true',
+                        help='Не засевать базу, если файл уже есть.')
+    parser.add_argument('--settings', default='blogicum.settings')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--locations', type=int, default=50)
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--comments', type=int, default=20_000)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=10,
+                        help='Длительность каждого прогона, в секундах.')
+    parser.add_argument('--max-page', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def worker(role, number, args, pragmas, start, results):
+    """Выполняет запросы одной роли до истечения времени прогона."""
+    setup_django(args.db, args.settings, migrate=False,
+                 sqlite_pragmas=pragmas)
+    from django.contrib.auth import get_user_model
+    from django.db import OperationalError
+
+    from blog.models import Post
+
+    rng = random.Random(args.seed * 1000 + number)
+    user = get_user_model().objects.order_by('id')[number]
+    post_ids = list(Post.objects.filter(
+        is_published=True, category__is_published=True
+    ).values_list('id', flat=True)[:1000])
+    client = make_client()
+    client.force_login(user)
+    client.get('/posts/create/')
+    csrf_token = client.cookies['csrftoken'].value
+
+    start.wait()
+    deadline = time.monotonic() + args.duration
+    latencies, locked, failed = [], 0, 0
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            if role == 'writer':
+                response = client.post(
+                    f'/posts/{rng.choice(post_ids)}/comment/',
+                    {'text': 'Комментарий', 'csrfmiddlewaretoken': csrf_token},
+                )
+            else:
+                page = rng.randint(1, args.max_page)
+                response = client.get(f'/?page={page}')
+        except OperationalError as error:
+            if 'locked' not in str(error):
+                raise
+            locked += 1
+            continue
+        if response.status_code >= 400:
+            failed += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    results.put((role, latencies, locked, failed))
+
+
+def run_round(args, pragmas):
+    """Запускает читателей и писателей одновременно и сводит результаты."""
+    context = multiprocessing.get_context('spawn')
+    start = context.Event()
+    results = context.Queue()
+    roles = ['reader'] * args.readers + ['writer'] * args.writers
+    processes = [
+        context.Process(
+            target=worker, args=(role, number, args, pragmas, start, results)
+        )
+        for number, role in enumerate(roles)
+    ]
+    for process in processes:
+        process.start()
+    start.set()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    summary = {}
+    for role in ('reader', 'writer'):
+        latencies, locked, failed = [], 0, 0
+        for name, role_latencies, role_locked, role_failed in collected:
+            if name == role:
+                latencies += role_latencies
+                locked += role_locked
+                failed += role_failed
+        summary[role] = {
+            'ops_per_second': len(latencies) / args.duration,
+            'p50_ms': percentile(latencies, 0.50) * 1000 if latencies else 0,
+            'p95_ms': percentile(latencies, 0.95) * 1000 if latencies else 0,
+            'locked': locked,
+            'failed': failed,
+        }
+    return summary
+
+
+def format_summary(name, summary):
+    return '\n'.join(
+        f'{name:<10} {role:<7} {stats["ops_per_second"]:8.1f} оп/с  '
+        f'p50 {stats["p50_ms"]:8.2f} мс  p95 {stats["p95_ms"]:8.2f} мс  '
+        f'locked {stats["locked"]}  ошибок {stats["failed"]}'
+        for role, stats in summary.items()
+    )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = None
+    if args.db is None:
+        workdir = tempfile.TemporaryDirectory(prefix='blogicum-bench-')
+        args.db = Path(workdir.name) / 'bench.sqlite3'
+    existed = args.db.exists()
+
+    setup_django(args.db, args.settings)
+    from django.conf import settings
+    from django.db import connections
+
+    if not (existed and args.reuse):
+        seed(
+            users=args.users, categories=args.categories,
+            locations=args.locations, posts=args.posts,
+            comments=args.comments, random_seed=args.seed,
+        )
+    tuned_pragmas = settings.SQLITE_PRAGMAS
+    connections.close_all()
+
+    for name, pragmas in (
+        ('rollback', ROLLBACK_PRAGMAS), ('tuned', tuned_pragmas)
+    ):
+        # Режим журнала меняется только без других открытых соединений.
+        settings.SQLITE_PRAGMAS = pragmas
+        connections['default'].ensure_connection()
+        connections.close_all()
+        print(format_summary(name, run_round(args, pragmas)))
+    if workdir:
+        workdir.cleanup()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,27 @@
+import os
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+
+def setup_django(db_path, settings_module='blogicum.settings', migrate=True,
+                 sqlite_pragmas=None):
+    """Настраивает Django на отдельную SQLite-базу и применяет миграции."""
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = str(db_path)
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.dummy.EmailBackend'
+    if sqlite_pragmas is not None:
+        settings.SQLITE_PRAGMAS = sqlite_pragmas
+    django.setup()
+
+    if migrate:
+        from django.core.management import call_command
+
+        call_command('migrate', verbosity=0)
@@ -0,0 +1,190 @@
+import random
+import statistics
+import time
+from contextlib import ExitStack
+
+
+class QueryCounter:
+    """Считает запросы и время в базе через execute_wrapper."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+class WSGIClientHandler:
+    """Пропускает запросы тестового клиента через настоящий WSGIHandler."""
+
+    def __init__(self):
+        from django.core.handlers.wsgi import WSGIHandler
+
+        self.application = WSGIHandler()
+
+    def __call__(self, environ):
+        response = self.application(environ, lambda status, headers: None)
+        if not response.streaming:
+            response.close()
+        return response
+
+
+def make_client():
+    from django.test import Client
+
+    client = Client()
+    client.handler = WSGIClientHandler()
+    return client
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(samples):
+    latencies = [sample['latency'] for sample in samples]
+    return {
+        'requests': len(samples),
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000,
+        'queries_mean': statistics.fmean(s['queries'] for s in samples),
+        'sql_ms_mean': statistics.fmean(s['sql'] for s in samples) * 1000,
+        'bytes_mean': statistics.fmean(s['bytes'] for s in samples),
+        'errors': sum(1 for s in samples if s['status'] >= 400),
+    }
+
+
+class Scenario:
+    """Набор запросов к одному представлению."""
+
+    def __init__(self, name, method, make_request):
+        self.name = name
+        self.method = method
+        self.make_request = make_request
+
+
+def build_scenarios(rng, max_page):
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Category, Post
+
+    User = get_user_model()
+    slugs = list(Category.objects.filter(
+        is_published=True
+    ).values_list('slug', flat=True)[:1000])
+    usernames = list(User.objects.values_list('username', flat=True)[:1000])
+    post_ids = list(Post.objects.filter(
+        is_published=True, category__is_published=True
+    ).order_by('?').values_list('id', flat=True)[:1000])
+    category_id = Category.objects.filter(
+        is_published=True
+    ).values_list('id', flat=True).first()
+
+    def page():
+        return rng.randint(1, max_page)
+
+    return [
+        Scenario('index', 'get', lambda: (f'/?page={page()}', None)),
+        Scenario('category_posts', 'get', lambda: (
+            f'/category/{rng.choice(slugs)}/?page={page()}', None
+        )),
+        Scenario('profile', 'get', lambda: (
+            f'/profile/{rng.choice(usernames)}/?page={page()}', None
+        )),
+        Scenario('post_detail', 'get', lambda: (
+            f'/posts/{rng.choice(post_ids)}/', None
+        )),
+        Scenario('add_comment', 'post', lambda: (
+            f'/posts/{rng.choice(post_ids)}/comment/',
+            {'text': 'Комментарий из бенчмарка'},
+        )),
+        Scenario('create_post', 'post', lambda: ('/posts/create/', {
+            'title': 'Пост из бенчмарка',
+            'text': 'Текст поста из бенчмарка',
+            'pub_date': '2020-01-01T10:00',
+            'category': category_id,
+        })),
+    ]
+
+
+def response_size(response):
+    if response.streaming:
+        size = sum(len(chunk) for chunk in response.streaming_content)
+        response.close()
+        return size
+    return len(response.content)
+
+
+def run(requests, warmup=5, max_page=50, anonymous=False, random_seed=0,
+        only=None, log=print):
+    """Прогоняет сценарии и возвращает сводку по каждому представлению."""
+    from django.contrib.auth import get_user_model
+    from django.db import connections
+
+    rng = random.Random(random_seed)
+    user = get_user_model().objects.order_by('id').first()
+    reader = make_client()
+    writer = make_client()
+    writer.force_login(user)
+    writer.get('/posts/create/')
+    csrf_token = writer.cookies['csrftoken'].value
+    if not anonymous:
+        reader.force_login(user)
+
+    results = {}
+    for scenario in build_scenarios(rng, max_page):
+        if only and scenario.name not in only:
+            continue
+        client = writer if scenario.method == 'post' else reader
+        samples = []
+        for number in range(warmup + requests):
+            url, data = scenario.make_request()
+            if data is not None:
+                data = {**data, 'csrfmiddlewaretoken': csrf_token}
+            counter = QueryCounter()
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(
+                        connections[alias].execute_wrapper(counter)
+                    )
+                started = time.perf_counter()
+                response = getattr(client, scenario.method)(url, data)
+                size = response_size(response)
+                latency = time.perf_counter() - started
+            if number >= warmup:
+                samples.append({
+                    'latency': latency,
+                    'queries': counter.count,
+                    'sql': counter.duration,
+                    'bytes': size,
+                    'status': response.status_code,
+                })
+        results[scenario.name] = summarize(samples)
+        log(format_row(scenario.name, results[scenario.name]))
+    return results
+
+
+def format_row(name, result, baseline=None):
+    row = (
+        f'{name:<15} p50 {result["p50_ms"]:8.2f} мс  '
+        f'p95 {result["p95_ms"]:8.2f} мс  p99 {result["p99_ms"]:8.2f} мс  '
+        f'SQL {result["queries_mean"]:5.1f} шт / '
+        f'{result["sql_ms_mean"]:7.2f} мс  '
+        f'{result["bytes_mean"] / 1024:7.1f} КБ'
+    )
+    if result['errors']:
+        row += f'  ошибок: {result["errors"]}'
+    if baseline:
+        delta = result['p50_ms'] / baseline['p50_ms'] - 1
+        row += f'  p50 {delta:+.1%} к базе'
+    return row
@@ -0,0 +1,101 @@
+import random
+import time
+from datetime import timedelta
+
+WORDS = (
+    'пост блог город море лес река утро вечер поездка книга кино музыка '
+    'кофе поезд горы друзья работа отпуск осень весна погода фото'
+).split()
+
+
+def _text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def _batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(users, categories, locations, posts, comments,
+         batch_size=5000, random_seed=0, log=print):
+    """Заполняет базу синтетическими данными через bulk_create."""
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from django.db import transaction
+    from django.utils import timezone
+
+    from blog.models import Category, Comment, Location, Post
+    from blog.search import rebuild_index, search_available
+    from blog.service import published_comment_count
+
+    User = get_user_model()
+    rng = random.Random(random_seed)
+    now = timezone.now()
+    password = make_password('benchmark')
+
+    def insert(model, rows, total):
+        started = time.perf_counter()
+        for batch in _batched(rows, batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+        log(f'{model.__name__}: {total} за '
+            f'{time.perf_counter() - started:.1f} с')
+
+    insert(User, (
+        User(username=f'user{number}', email=f'user{number}@example.com',
+             password=password)
+        for number in range(users)
+    ), users)
+    insert(Category, (
+        Category(title=f'Категория {number}', slug=f'category-{number}',
+                 description=_text(rng, 20), is_published=number % 20 != 0)
+        for number in range(categories)
+    ), categories)
+    insert(Location, (
+        Location(name=f'Место {number}') for number in range(locations)
+    ), locations)
+
+    user_ids = list(User.objects.values_list('id', flat=True))
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    location_ids = list(Location.objects.values_list('id', flat=True))
+    insert(Post, (
+        Post(
+            title=_text(rng, 4).capitalize(),
+            text=_text(rng, rng.randint(30, 300)),
+            pub_date=now - timedelta(minutes=rng.randint(-10_000, 10**7)),
+            author_id=rng.choice(user_ids),
+            category_id=rng.choice(category_ids),
+            location_id=rng.choice(location_ids + [None]),
+            is_published=rng.random() > 0.05,
+        )
+        for _ in range(posts)
+    ), posts)
+
+    first_post, last_post = (
+        Post.objects.order_by('id').values_list('id', flat=True).first(),
+        Post.objects.order_by('-id').values_list('id', flat=True).first(),
+    )
+    if comments and first_post:
+        insert(Comment, (
+            Comment(
+                text=_text(rng, rng.randint(5, 60)),
+                post_id=rng.randint(first_post, last_post),
+                author_id=rng.choice(user_ids),
+            )
+            for _ in range(comments)
+        ), comments)
+
+    Post.objects.update(comment_count=published_comment_count())
+    Post.objects.filter(is_published=True, pub_date__lte=now).update(
+        is_live=True
+    )
+    if search_available():
+        rebuild_index()
+    log('Счётчики комментариев и поисковый индекс обновлены')
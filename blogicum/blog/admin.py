@@ -1,27 +1,144 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+from django.utils.translation import gettext_lazy as _
 
+from blog.constants import ADMIN_PREVIEW_POSTS
 from blog.models import Category, Comment, Location, Post
 
 admin.site.empty_value_display = 'Не задано'
 
+# Символ больше любого другого: верхняя граница диапазона для префикса.
+PREFIX_UPPER_BOUND = '\U0010ffff'
 
-class PostInline(admin.StackedInline):
-    model = Post
-    extra = 0
+
+def _prefix_condition(model, path, prefix):
+    """Условие «поле начинается с prefix» в виде диапазона по индексу.
+
+    Для поля связанной модели диапазон выносится в подзапрос, чтобы
+    SQLite сначала нашёл связанные записи по индексу, а не перебирал
+    строки основной таблицы.
+    """
+    relation, _sep, field = path.rpartition('__')
+    upper = prefix + PREFIX_UPPER_BOUND
+    lookup = {f'{field}__gte': prefix, f'{field}__lt': upper}
+    if not relation:
+        return Q(**lookup)
+    related_model = model._meta.get_field(relation).related_model
+    return Q(**{
+        f'{relation}__in': related_model.objects.filter(**lookup).values('pk')
+    })
+
+
+class PrefixSearchMixin:
+    """Поиск по началу значений search_fields с учётом регистра.
+
+    В отличие от стандартного ``icontains``, который сканирует таблицу,
+    префикс ищется сравнением по диапазону и использует индексы полей.
+    """
+
+    def use_prefix_search(self, request):
+        return True
+
+    def get_search_results(self, request, queryset, search_term):
+        if not self.use_prefix_search(request):
+            return super().get_search_results(request, queryset, search_term)
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        condition = Q()
+        for path in self.get_search_fields(request):
+            condition |= _prefix_condition(queryset.model, path, term)
+        return queryset.filter(condition), False
+
+
+class AutocompleteFilter(admin.FieldListFilter):
+    """Фильтр по связанной записи, варианты которого грузятся по запросу.
+
+    Стандартный фильтр выводит в боковой панели все связанные записи;
+    этот показывает поле автодополнения, которое ищет их через
+    ``search_fields`` админки связанной модели.
+    """
+
+    template = 'admin/blog/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin,
+                 field_path):
+        self.lookup_kwarg = f'{field_path}__{field.target_field.name}__exact'
+        self.lookup_val = params.get(self.lookup_kwarg)
+        self.model_admin = model_admin
+        super().__init__(
+            field, request, params, model, model_admin, field_path
+        )
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.lookup_val is None,
+            'query_string': changelist.get_query_string(
+                remove=[self.lookup_kwarg]
+            ),
+            'display': _('All'),
+        }
+
+    def render_widget(self):
+        form_field = self.field.formfield(
+            widget=AutocompleteSelect(self.field, self.model_admin.admin_site),
+            required=False,
+        )
+        return form_field.widget.render(
+            self.lookup_kwarg, self.lookup_val,
+            attrs={'data-autocomplete-filter': '', 'style': 'width: 100%'},
+        )
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    inlines = (
-        PostInline,
-    )
     list_display = (
         'title',
     )
+    readonly_fields = (
+        'post_count',
+        'latest_posts',
+    )
+
+    @admin.display(description='Публикаций')
+    def post_count(self, category):
+        if category.pk is None:
+            return 0
+        url = reverse('admin:blog_post_changelist')
+        return format_html(
+            '{} (<a href="{}?category__id__exact={}">все публикации</a>)',
+            category.posts.count(), url, category.pk,
+        )
+
+    @admin.display(description='Последние публикации')
+    def latest_posts(self, category):
+        if category.pk is None:
+            return None
+        posts = category.posts.order_by('-pub_date').values_list(
+            'pk', 'title'
+        )[:ADMIN_PREVIEW_POSTS]
+        items = format_html_join(
+            '\n', '<li><a href="{}">{}</a></li>',
+            (
+                (reverse('admin:blog_post_change', args=[pk]), title)
+                for pk, title in posts
+            ),
+        )
+        return format_html('<ul>{}</ul>', items) if items else None
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(PrefixSearchMixin, admin.ModelAdmin):
     list_display = (
         'title',
         'pub_date',
@@ -38,10 +155,36 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('title',)
     list_filter = ('category',)
     list_display_links = ('title',)
+    list_select_related = (
+        'author',
+        'category',
+        'location',
+    )
+    autocomplete_fields = (
+        'author',
+        'location',
+    )
+
+    def use_prefix_search(self, request):
+        """Префиксный поиск — только для автодополнения в фильтрах.
+
+        Поиск в списке публикаций остаётся обычным, без учёта регистра.
+        """
+        match = request.resolver_match
+        return match is not None and match.url_name == 'autocomplete'
+
+    def get_changelist_formset(self, request, **kwargs):
+        """Список категорий строится один раз на всю страницу."""
+        formset = super().get_changelist_formset(request, **kwargs)
+        field = formset.form.base_fields['category']
+        field.choices = list(field.choices)
+        widget = getattr(field.widget, 'widget', field.widget)
+        widget.choices = field.choices
+        return formset
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(PrefixSearchMixin, admin.ModelAdmin):
     list_display = (
         'post',
         'author',
@@ -50,7 +193,30 @@ class CommentAdmin(admin.ModelAdmin):
     )
     list_editable = ('is_published',)
     search_fields = ('author__username', 'post__title')
-    list_filter = ('is_published', 'post')
+    list_filter = (
+        'is_published',
+        ('post', AutocompleteFilter),
+        ('author', AutocompleteFilter),
+    )
+    list_select_related = (
+        'post',
+        'author',
+    )
 
+    @property
+    def media(self):
+        widget = AutocompleteSelect(
+            Comment._meta.get_field('post'), self.admin_site
+        )
+        return super().media + widget.media + forms.Media(
+            js=['admin/js/jquery.init.js', 'js/autocomplete_filter.js']
+        )
 
-admin.site.register(Location)
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'is_published'
+    )
+    search_fields = ('name',)
@@ -0,0 +1,158 @@
+import time
+from functools import wraps
+from hashlib import md5
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog.constants import (FEED_COUNT_EXACT_TIMEOUT,
+                            FEED_COUNT_REFRESH_TIMEOUT, FEED_COUNT_TIMEOUT,
+                            PAGE_CACHE_TIMEOUT)
+
+CONTENT_VERSION_KEY = 'blog:content_version'
+CONTENT_CHANGED_KEY = 'blog:content_changed_at'
+PAGE_PARAMS = ('page', 'cursor')
+FEED_COUNT_GENERATION_KEY = 'blog:feed_count_generation'
+IMAGE_VARIANTS_VERSION_KEY = 'blog:image_variants_version'
+
+
+def bump_content_version():
+    """Делает недействительными все закешированные страницы."""
+    try:
+        cache.incr(CONTENT_VERSION_KEY)
+    except ValueError:
+        cache.set(CONTENT_VERSION_KEY, time.time_ns(), None)
+    cache.set(CONTENT_CHANGED_KEY, timezone.now(), None)
+
+
+def get_content_version():
+    """Текущая версия контента.
+
+    Версия меняется при любом изменении постов, комментариев, категорий и
+    местоположений, а также при отложенной публикации (её выполняет
+    команда publish_scheduled). Чтение версии ничего не пишет в базу.
+    """
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        cache.add(CONTENT_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CONTENT_VERSION_KEY)
+    return version
+
+
+def image_variants_version():
+    """Версия набора уменьшенных копий; входит в ключ кеша карточек."""
+    return cache.get(IMAGE_VARIANTS_VERSION_KEY, 0)
+
+
+def bump_image_variants_version():
+    """Сбрасывает карточки после того, как для постов появились копии."""
+    try:
+        cache.incr(IMAGE_VARIANTS_VERSION_KEY)
+    except ValueError:
+        cache.set(IMAGE_VARIANTS_VERSION_KEY, time.time_ns(), None)
+    bump_content_version()
+
+
+def content_changed_at():
+    """Время последнего изменения контента — Last-Modified для лент."""
+    get_content_version()
+    changed_at = cache.get(CONTENT_CHANGED_KEY)
+    if changed_at is None:
+        cache.add(CONTENT_CHANGED_KEY, timezone.now(), None)
+        changed_at = cache.get(CONTENT_CHANGED_KEY)
+    return changed_at
+
+
+def _page_params(request):
+    return '&'.join(
+        f'{name}={request.GET.get(name, "")}' for name in PAGE_PARAMS
+    )
+
+
+def page_cache_key(request):
+    digest = md5(
+        f'{request.path}?{_page_params(request)}'.encode()
+    ).hexdigest()
+    return f'blog:page:{get_content_version()}:{digest}'
+
+
+def feed_etag(request, *args, **kwargs):
+    """Значение ETag ленты: версия контента, страница и пользователь.
+
+    Считается без запросов к базе, поэтому повторный запрос неизменённой
+    ленты получает 304 до выборки постов и рендера шаблона.
+    """
+    return md5(
+        f'{get_content_version()}:{request.path}?{_page_params(request)}'
+        f':{request.user.pk}'.encode()
+    ).hexdigest()
+
+
+def feed_last_modified(request, *args, **kwargs):
+    return content_changed_at()
+
+
+def cache_anonymous_page(view):
+    """Кеширует страницу целиком для анонимных GET-запросов."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or request.user.is_authenticated
+        ):
+            return view(request, *args, **kwargs)
+        key = page_cache_key(request)
+        response = cache.get(key)
+        if response is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.cookies:
+                cache.set(key, response, PAGE_CACHE_TIMEOUT)
+        return response
+    return wrapper
+
+
+def feed_count_keys(feed):
+    """Ключи счётчика ленты: значение, признак точности и блокировка.
+
+    Значение живёт дольше признака точности: устаревшее значение отдаётся
+    как приблизительное, пока один из запросов пересчитывает его.
+    """
+    generation = cache.get(FEED_COUNT_GENERATION_KEY, 0)
+    return (
+        f'blog:feed_count:{feed}',
+        f'blog:feed_count_exact:{generation}:{feed}',
+        f'blog:feed_count_refresh:{feed}',
+    )
+
+
+def adjust_feed_count(feed, delta):
+    """Инкрементально меняет сохранённый счётчик ленты, если он есть."""
+    try:
+        cache.incr(f'blog:feed_count:{feed}', delta)
+    except ValueError:
+        pass
+
+
+def invalidate_feed_counts():
+    """Помечает все счётчики лент как приблизительные."""
+    try:
+        cache.incr(FEED_COUNT_GENERATION_KEY)
+    except ValueError:
+        cache.set(FEED_COUNT_GENERATION_KEY, time.time_ns(), None)
+
+
+def get_feed_count(feed, count_func):
+    """Число постов в ленте: из кеша, приблизительное или пересчитанное."""
+    count_key, exact_key, refresh_key = feed_count_keys(feed)
+    values = cache.get_many([count_key, exact_key])
+    count = values.get(count_key)
+    if count is not None and (
+        values.get(exact_key)
+        or not cache.add(refresh_key, True, FEED_COUNT_REFRESH_TIMEOUT)
+    ):
+        return max(count, 0)
+    count = count_func()
+    cache.set(count_key, count, FEED_COUNT_TIMEOUT)
+    cache.set(exact_key, True, FEED_COUNT_EXACT_TIMEOUT)
+    cache.delete(refresh_key)
+    return count
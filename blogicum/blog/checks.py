@@ -0,0 +1,84 @@
+import re
+
+from django.core.checks import Error, Tags, Warning, register
+from django.db import DatabaseError, connections
+
+from blog.models import Post
+from blog.service import get_filter_posts
+
+FEED_QUERIES = (
+    ('главная лента', lambda: get_filter_posts(not_user=True)),
+    ('лента категории', lambda: get_filter_posts(category=1, not_user=True)),
+    ('лента профиля', lambda: get_filter_posts(author=1, not_user=True)),
+    ('профиль автора', lambda: get_filter_posts(author=1)),
+)
+
+TEMP_SORT = re.compile(r'USE TEMP B-TREE FOR (RIGHT PART OF )?ORDER BY')
+
+
+def explain_feed_queries(using='default'):
+    """Возвращает планы запросов лент в виде [(название, план), ...]."""
+    return [
+        (name, build().using(using)[:10].explain())
+        for name, build in FEED_QUERIES
+    ]
+
+
+def slow_plan_steps(plan):
+    """Шаги плана с полным сканированием постов или сортировкой в памяти."""
+    full_scan = re.compile(
+        rf'SCAN (TABLE )?{Post._meta.db_table}(?! USING)'
+    )
+    return [
+        line for line in plan.splitlines()
+        if full_scan.search(line) or TEMP_SORT.search(line)
+    ]
+
+
+def _missing_indexes(connection):
+    if Post._meta.db_table not in connection.introspection.table_names():
+        return [index.name for index in Post._meta.indexes]
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, Post._meta.db_table
+        )
+    return [
+        index.name for index in Post._meta.indexes
+        if index.name not in constraints
+    ]
+
+
+@register(Tags.database)
+def check_feed_query_plans(app_configs, databases=None, **kwargs):
+    """Проверяет, что ленты читаются по индексам без сортировки в памяти.
+
+    Запускается командой ``manage.py check --database default``.
+    """
+    errors = []
+    for alias in databases or ():
+        connection = connections[alias]
+        if connection.vendor != 'sqlite':
+            continue
+        try:
+            missing = _missing_indexes(connection)
+            plans = [] if missing else explain_feed_queries(alias)
+        except DatabaseError as error:
+            missing, plans = [str(error)], []
+        if missing:
+            errors.append(Warning(
+                'Индексы лент ещё не созданы: ' + ', '.join(missing),
+                hint='Выполните manage.py migrate.',
+                obj=Post,
+                id='blog.W001',
+            ))
+        for name, plan in plans:
+            steps = slow_plan_steps(plan)
+            if steps:
+                errors.append(Error(
+                    f'Запрос «{name}» не использует индекс: '
+                    + '; '.join(steps),
+                    hint=plan,
+                    obj=Post,
+                    id='blog.E001',
+                ))
+    return errors
@@ -1,2 +1,19 @@
 NUMBER_POSTS = 10
 NUMBER_CHARACTERS = 20
+PAGE_CACHE_TIMEOUT = 60 * 15
+FEED_COUNT_TIMEOUT = 60 * 60 * 24
+FEED_COUNT_EXACT_TIMEOUT = 60 * 5
+FEED_COUNT_REFRESH_TIMEOUT = 30
+IMAGE_VARIANTS = {
+    'card': (640, 640),
+    'detail': (1280, 1280),
+}
+IMAGE_VARIANT_QUALITY = 85
+SEARCH_RESULTS_LIMIT = 1000
+COMMENTS_PER_PAGE = 50
+FEED_ITEMS = 20
+SITEMAP_URLS_PER_FILE = 50000
+SITEMAP_CHUNK_SIZE = 2000
+EXPORT_CHUNK_SIZE = 2000
+ADMIN_PREVIEW_POSTS = 10
+EXPORT_OVERLAP = 60 * 5
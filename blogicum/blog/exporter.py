@@ -0,0 +1,188 @@
+import csv
+import gzip
+import json
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from blog.constants import EXPORT_CHUNK_SIZE, EXPORT_OVERLAP
+from blog.models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+STATE_FILE = '.export_state.json'
+
+# Модель, выгружаемые поля и поле даты, по которому выгрузка инкрементальна.
+# Небольшие справочники и пользователи, у которых нет даты изменения,
+# выгружаются целиком при каждом запуске.
+EXPORTS = {
+    'posts': (Post, (
+        'id', 'title', 'text', 'description', 'image', 'pub_date',
+        'created_at', 'updated_at', 'is_published', 'is_live',
+        'author_id', 'category_id', 'location_id', 'comment_count',
+    ), 'updated_at'),
+    'comments': (Comment, (
+        'id', 'post_id', 'author_id', 'text', 'created_at', 'updated_at',
+        'is_published',
+    ), 'updated_at'),
+    'categories': (Category, (
+        'id', 'title', 'slug', 'description', 'is_published', 'created_at',
+    ), None),
+    'locations': (Location, (
+        'id', 'name', 'is_published', 'created_at',
+    ), None),
+    'users': (User, (
+        'id', 'username', 'first_name', 'last_name', 'email', 'is_active',
+        'date_joined', 'last_login',
+    ), None),
+}
+
+
+def _open(path, compress):
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def _plain(row):
+    return {
+        name: value.isoformat() if hasattr(value, 'isoformat') else value
+        for name, value in row.items()
+    }
+
+
+def write_rows(rows, path, fields, file_format='jsonl', compress=False):
+    """Пишет строки в файл по одной; возвращает их число."""
+    count = 0
+    with _open(path, compress) as output:
+        if file_format == 'csv':
+            writer = csv.DictWriter(output, fieldnames=fields)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(_plain(row))
+                count += 1
+        else:
+            for row in rows:
+                output.write(json.dumps(
+                    row, cls=DjangoJSONEncoder, ensure_ascii=False
+                ))
+                output.write('\n')
+                count += 1
+    return count
+
+
+class Exporter:
+    """Потоковая выгрузка таблиц блога в JSONL или CSV.
+
+    Строки читаются через ``values().iterator()`` пачками по
+    ``chunk_size`` и сразу пишутся в файл, поэтому память не растёт с
+    размером таблиц. Для таблиц с датой изменения выгружаются строки,
+    изменённые после сохранённой отметки (high-water mark) и не позже
+    момента запуска. Отметка сдвигается назад на ``overlap``: так
+    попадают строки, записанные с более ранней датой, но закоммиченные
+    уже после прошлой выгрузки. Строки из этого окна, уже выгруженные с
+    той же датой изменения, пропускаются.
+    """
+
+    def __init__(self, root=None, file_format='jsonl', compress=False,
+                 chunk_size=EXPORT_CHUNK_SIZE, state_file=None,
+                 overlap=EXPORT_OVERLAP):
+        self.root = Path(root or settings.BLOG_EXPORT_ROOT)
+        self.file_format = file_format
+        self.compress = compress
+        self.chunk_size = chunk_size
+        self.state_file = Path(state_file or self.root / STATE_FILE)
+        self.overlap = timedelta(seconds=overlap)
+
+    def load_state(self):
+        if not self.state_file.exists():
+            return {}
+        return {
+            name: {
+                'mark': parse_datetime(table['mark']),
+                'recent': {tuple(key) for key in table['recent']},
+            }
+            for name, table in json.loads(self.state_file.read_text()).items()
+        }
+
+    def save_state(self, state):
+        temp_path = self.state_file.with_suffix('.tmp')
+        temp_path.write_text(json.dumps({
+            name: {
+                'mark': table['mark'].isoformat(),
+                'recent': sorted(table['recent']),
+            }
+            for name, table in state.items()
+        }))
+        os.replace(temp_path, self.state_file)
+
+    def export(self, names=None, full=False, until=None):
+        """Выгружает указанные таблицы; возвращает {таблица: (файл, строк)}."""
+        until = until or timezone.now()
+        self.root.mkdir(parents=True, exist_ok=True)
+        state = self.load_state()
+        results = {}
+        for name in names or EXPORTS:
+            previous = None if full else state.get(name)
+            path, count, recent = self.export_table(name, previous, until)
+            results[name] = (path, count)
+            if EXPORTS[name][2] is not None:
+                state[name] = {'mark': until, 'recent': recent}
+                self.save_state(state)
+        return results
+
+    def export_table(self, name, previous, until):
+        """Пишет файл таблицы; возвращает путь, число строк и окно дублей."""
+        model, fields, mark = EXPORTS[name]
+        queryset = model.objects.order_by()
+        if mark is not None:
+            queryset = queryset.filter(**{f'{mark}__lte': until})
+        if previous is not None:
+            queryset = queryset.filter(
+                **{f'{mark}__gt': previous['mark'] - self.overlap}
+            )
+        recent = set()
+        if mark is None:
+            rows = queryset.values(*fields).iterator(
+                chunk_size=self.chunk_size
+            )
+        else:
+            rows = self._new_rows(
+                queryset.values(*fields, export_mark=F(mark)).iterator(
+                    chunk_size=self.chunk_size
+                ),
+                previous['recent'] if previous else set(),
+                recent,
+                until - self.overlap,
+            )
+        extension = self.file_format + ('.gz' if self.compress else '')
+        path = self.root / f'{name}-{until:%Y%m%dT%H%M%S}.{extension}'
+        temp_path = path.with_name(f'{path.name}.tmp')
+        count = write_rows(
+            rows, temp_path, fields, self.file_format, self.compress
+        )
+        os.replace(temp_path, path)
+        return path, count, recent
+
+    @staticmethod
+    def _new_rows(rows, exported, recent, window_start):
+        """Пропускает строки, уже выгруженные с той же датой изменения.
+
+        Ключи строк, попавших в окно перекрытия, собираются в ``recent``
+        для следующего запуска.
+        """
+        for row in rows:
+            changed_at = row.pop('export_mark')
+            key = (row['id'], changed_at.isoformat())
+            if key in exported:
+                continue
+            if changed_at > window_start:
+                recent.add(key)
+            yield row
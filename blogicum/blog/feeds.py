@@ -0,0 +1,147 @@
+from io import StringIO
+from itertools import chain
+
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.xmlutils import SimplerXMLGenerator
+
+from blog.cache import content_changed_at, page_cache_key
+from blog.constants import FEED_ITEMS, PAGE_CACHE_TIMEOUT
+
+
+class StreamingFeedMixin:
+    """Отдаёт ленту по частям: каждый пост сериализуется по мере чтения.
+
+    Посты не накапливаются в ``self.items``, как в обычных генераторах
+    лент, а берутся из итератора и сразу пишутся в ответ.
+    """
+
+    item_element = None
+    # Корневые элементы документа снаружи внутрь: (тег, метод атрибутов).
+    root_elements = ()
+
+    def start_document(self, handler):
+        for tag, attributes in self.root_elements:
+            handler.startElement(tag, getattr(self, attributes)())
+
+    def end_document(self, handler):
+        for tag, _attributes in reversed(self.root_elements):
+            handler.endElement(tag)
+
+    def latest_post_date(self):
+        return self.feed.get('updated') or super().latest_post_date()
+
+    def make_item(self, **kwargs):
+        self.add_item(**kwargs)
+        return self.items.pop()
+
+    def stream(self, items, encoding='utf-8'):
+        buffer = StringIO()
+        handler = SimplerXMLGenerator(buffer, encoding)
+        handler.startDocument()
+        self.start_document(handler)
+        self.add_root_elements(handler)
+        for item in items:
+            handler.startElement(
+                self.item_element, self.item_attributes(item)
+            )
+            self.add_item_elements(handler, item)
+            handler.endElement(self.item_element)
+            yield _drain(buffer)
+        self.end_document(handler)
+        yield _drain(buffer)
+
+
+class StreamingRssFeed(StreamingFeedMixin, Rss201rev2Feed):
+    item_element = 'item'
+    root_elements = (
+        ('rss', 'rss_attributes'),
+        ('channel', 'root_attributes'),
+    )
+
+
+class StreamingAtomFeed(StreamingFeedMixin, Atom1Feed):
+    item_element = 'entry'
+    root_elements = (
+        ('feed', 'root_attributes'),
+    )
+
+
+FEED_FORMATS = {
+    'rss': StreamingRssFeed,
+    'atom': StreamingAtomFeed,
+}
+
+
+def _drain(buffer):
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
+
+
+def _post_items(request, feed, posts):
+    for post in posts:
+        link = request.build_absolute_uri(post.get_absolute_url())
+        yield feed.make_item(
+            title=post.title,
+            link=link,
+            description=post.text,
+            author_name=post.author.username,
+            pubdate=post.pub_date,
+            updateddate=post.updated_at,
+            unique_id=link,
+            categories=(post.category.title,) if post.category else (),
+        )
+
+
+def _cached_stream(chunks, key):
+    """Отдаёт части ленты и кеширует её целиком, если поток дочитан."""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    cache.set(key, ''.join(parts), PAGE_CACHE_TIMEOUT)
+
+
+def feed_response(request, feed_class, channel):
+    """Ответ с лентой постов; готовая лента берётся из кеша.
+
+    ``channel`` вызывается только при промахе кеша и возвращает заголовок,
+    ссылку, описание и итератор постов. Ключ кеша содержит версию
+    контента, поэтому лента сбрасывается при любом изменении постов.
+    """
+    key = page_cache_key(request)
+    content_type = (
+        f'{feed_class.content_type.split(";")[0]}; charset=utf-8'
+    )
+    body = cache.get(key)
+    if body is not None:
+        return HttpResponse(body, content_type=content_type)
+    title, link, description, posts = channel()
+    feed = feed_class(
+        title=title,
+        link=request.build_absolute_uri(link),
+        description=description,
+        language='ru',
+        feed_url=request.build_absolute_uri(),
+        updated=content_changed_at(),
+    )
+    chunks = feed.stream(_post_items(request, feed, posts))
+    return StreamingHttpResponse(
+        _cached_stream(chunks, key), content_type=content_type
+    )
+
+
+def latest_posts(queryset):
+    """Первый пост ленты и итератор по всем её постам.
+
+    Первый пост нужен до начала потока: по нему берутся данные категории
+    или автора без отдельного запроса.
+    """
+    rows = queryset[:FEED_ITEMS].iterator()
+    first = next(rows, None)
+    if first is None:
+        return None, iter(())
+    return first, chain((first,), rows)
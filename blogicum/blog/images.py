@@ -0,0 +1,76 @@
+import logging
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from blog.constants import IMAGE_VARIANT_QUALITY, IMAGE_VARIANTS
+
+logger = logging.getLogger(__name__)
+
+
+def variant_name(name, variant):
+    """Путь копии: blog_images/x.png -> blog_images/card/x.png.jpg.
+
+    Расширение оригинала остаётся в имени, чтобы у x.png и x.jpg были
+    разные копии.
+    """
+    head, tail = os.path.split(name)
+    return os.path.join(head, variant, f'{tail}.jpg')
+
+
+def generate_variants(name, force=False, storage=default_storage):
+    """Создаёт уменьшенные копии изображения; возвращает их число."""
+    targets = {
+        variant: variant_name(name, variant) for variant in IMAGE_VARIANTS
+    }
+    if not force:
+        targets = {
+            variant: target for variant, target in targets.items()
+            if not storage.exists(target)
+        }
+    if not targets:
+        return 0
+
+    with storage.open(name, 'rb') as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image.load()
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    for variant, target in targets.items():
+        thumbnail = image.copy()
+        thumbnail.thumbnail(
+            IMAGE_VARIANTS[variant], Image.Resampling.LANCZOS
+        )
+        buffer = BytesIO()
+        thumbnail.save(
+            buffer, 'JPEG', quality=IMAGE_VARIANT_QUALITY, optimize=True
+        )
+        if storage.exists(target):
+            storage.delete(target)
+        storage.save(target, ContentFile(buffer.getvalue()))
+    return len(targets)
+
+
+def backfill_variants(name, force=False):
+    """Обёртка для пула процессов: ошибка одного файла не роняет пул."""
+    try:
+        return name, generate_variants(name, force), None
+    except (OSError, ValueError) as error:
+        return name, 0, str(error)
+
+
+def generate_variants_safely(name):
+    """Создаёт копии при сохранении поста; ошибка файла только в лог.
+
+    Пост уже сохранён, поэтому битое изображение не должно давать 500:
+    шаблоны покажут оригинал, а копии можно досоздать generate_thumbnails.
+    """
+    try:
+        return generate_variants(name)
+    except (OSError, ValueError):
+        logger.exception('Не удалось создать копии изображения %s', name)
+        return 0
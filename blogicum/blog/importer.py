@@ -0,0 +1,250 @@
+import json
+import time
+from pathlib import Path
+
+from core.routers import note_shared_write
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from blog.cache import bump_content_version, invalidate_feed_counts
+from blog.models import Category, Comment, ImportedObject, Location, Post
+from blog.search import index_posts, search_available
+from blog.service import refresh_comment_count
+
+User = get_user_model()
+
+
+class ArchiveRowError(ValueError):
+    """Строка архива, которую нельзя импортировать."""
+
+
+class LookupCache:
+    """Идентификаторы связанных объектов по ключу; недостающие создаются."""
+
+    def __init__(self, model, field, defaults=None):
+        self.model = model
+        self.field = field
+        self.defaults = defaults or (lambda key: {})
+        self.ids = {}
+
+    def get(self, key):
+        if key in (None, ''):
+            return None
+        if key not in self.ids:
+            lookup = {self.field: key}
+            pk = self.model.objects.filter(**lookup).values_list(
+                'pk', flat=True
+            ).first()
+            if pk is None:
+                pk = self.model.objects.create(
+                    **lookup, **self.defaults(key)
+                ).pk
+            self.ids[key] = pk
+        return self.ids[key]
+
+
+def imported_ids(kind, source_ids):
+    """Первичные ключи уже импортированных объектов по ключам из архива."""
+    return dict(ImportedObject.objects.filter(
+        kind=kind, source_id__in=source_ids
+    ).values_list('source_id', 'object_id'))
+
+
+def insert_new(model, kind, objects):
+    """Вставляет объекты, которых ещё нет в ImportedObject.
+
+    У каждого объекта в ``source_id`` лежит идентификатор из архива.
+    Объекты сохраняются по одному, как в loaddata (``raw=True``): ключи
+    выдаёт база, а даты из архива не перезаписываются auto_now_add.
+    Соответствие ключей сохраняется в ImportedObject. Возвращает список
+    вставленных объектов.
+    """
+    seen = set(imported_ids(kind, {obj.source_id for obj in objects}))
+    new = []
+    for obj in objects:
+        if obj.source_id not in seen:
+            seen.add(obj.source_id)
+            new.append(obj)
+    for obj in new:
+        obj.save_base(raw=True, force_insert=True)
+    ImportedObject.objects.bulk_create(
+        ImportedObject(kind=kind, source_id=obj.source_id, object_id=obj.pk)
+        for obj in new
+    )
+    return new
+
+
+def _required(row, key, max_length=None):
+    value = row.get(key)
+    if value is None or value == '':
+        raise ArchiveRowError(f'не заполнено поле {key}')
+    if not isinstance(value, str):
+        raise ArchiveRowError(f'поле {key} должно быть строкой')
+    if max_length is not None and len(value) > max_length:
+        raise ArchiveRowError(f'поле {key} длиннее {max_length} символов')
+    return value
+
+
+def _datetime(value, default=None):
+    if not value:
+        if default is None:
+            raise ArchiveRowError('не указана дата')
+        return default
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ArchiveRowError(f'неверная дата: {value}')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, timezone.utc)
+    return parsed
+
+
+class JsonlImporter:
+    """Потоковый импорт постов и комментариев из JSONL.
+
+    Каждая строка — объект с ключом ``type`` (``post`` или ``comment``)
+    и ``id`` из архива. Объекты получают новые первичные ключи, а
+    соответствие ключей хранится в ImportedObject: по нему комментарии
+    привязываются к импортированным постам, а повторно прочитанные строки
+    пропускаются. Строки без автора, заголовка или текста пропускаются
+    ещё при чтении и попадают в лог, не прерывая пачку. Строки копятся
+    пачками и вставляются в отдельной транзакции; после каждой пачки в
+    файл контрольной точки пишется смещение в архиве, и повторный запуск
+    продолжает с него.
+    """
+
+    def __init__(self, path, batch_size=1000, checkpoint=None, log=print):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.checkpoint = Path(checkpoint or f'{path}.checkpoint')
+        self.log = log
+        self.now = timezone.now()
+        self.authors = LookupCache(
+            User, 'username',
+            lambda username: {'password': make_password(None)},
+        )
+        self.categories = LookupCache(
+            Category, 'slug',
+            lambda slug: {'title': slug, 'description': ''},
+        )
+        self.locations = LookupCache(Location, 'name')
+        self.posts = []
+        self.comments = []
+        self.stats = {'posts': 0, 'comments': 0, 'existing': 0, 'skipped': 0}
+
+    def run(self):
+        offset = self._load_checkpoint()
+        started = time.monotonic()
+        with open(self.path, 'rb') as source:
+            source.seek(offset)
+            for raw in source:
+                offset += len(raw)
+                self._add(raw, offset)
+                if len(self.posts) + len(self.comments) >= self.batch_size:
+                    self._flush(offset, started)
+            self._flush(offset, started)
+        invalidate_feed_counts()
+        bump_content_version()
+        note_shared_write()
+        self.checkpoint.unlink(missing_ok=True)
+        return self.stats
+
+    def _load_checkpoint(self):
+        if not self.checkpoint.exists():
+            return 0
+        offset = json.loads(self.checkpoint.read_text())['offset']
+        self.log(f'Продолжаем импорт с позиции {offset}')
+        return offset
+
+    def _add(self, raw, offset):
+        line = raw.strip()
+        if not line:
+            return
+        try:
+            row = json.loads(line)
+            kind = row.get('type')
+            if kind == 'post':
+                self.posts.append(self._post(row))
+            elif kind == 'comment':
+                self.comments.append(self._comment(row))
+            else:
+                raise ArchiveRowError(f'неизвестный тип строки: {kind}')
+        except (ValueError, KeyError, TypeError) as error:
+            self.stats['skipped'] += 1
+            self.log(f'Строка до позиции {offset} пропущена: {error!r}')
+
+    def _post(self, row):
+        pub_date = _datetime(row.get('pub_date'), self.now)
+        is_published = row.get('is_published', True)
+        post = Post(
+            title=_required(
+                row, 'title', Post._meta.get_field('title').max_length
+            ),
+            text=_required(row, 'text'),
+            description=row.get('description', ''),
+            image=row.get('image', ''),
+            pub_date=pub_date,
+            created_at=_datetime(row.get('created_at'), pub_date),
+            updated_at=self.now,
+            is_published=is_published,
+            is_live=is_published and pub_date <= self.now,
+            author_id=self.authors.get(_required(row, 'author')),
+            category_id=self.categories.get(row.get('category')),
+            location_id=self.locations.get(row.get('location')),
+        )
+        post.source_id = int(row['id'])
+        return post
+
+    def _comment(self, row):
+        comment = Comment(
+            text=_required(row, 'text'),
+            created_at=_datetime(row.get('created_at'), self.now),
+            updated_at=self.now,
+            is_published=row.get('is_published', True),
+            author_id=self.authors.get(_required(row, 'author')),
+        )
+        comment.source_id = int(row['id'])
+        comment.source_post_id = int(row['post'])
+        return comment
+
+    def _flush(self, offset, started):
+        posts, comments = self.posts, self.comments
+        if not posts and not comments:
+            self.checkpoint.write_text(json.dumps({'offset': offset}))
+            return
+        self.posts, self.comments = [], []
+        with transaction.atomic():
+            new_posts = insert_new(Post, 'post', posts)
+            post_ids = imported_ids(
+                'post', {comment.source_post_id for comment in comments}
+            )
+            orphans = [
+                c for c in comments if c.source_post_id not in post_ids
+            ]
+            comments = [c for c in comments if c.source_post_id in post_ids]
+            for comment in comments:
+                comment.post_id = post_ids[comment.source_post_id]
+            new_comments = insert_new(Comment, 'comment', comments)
+            refresh_comment_count(*{c.post_id for c in new_comments})
+            if search_available():
+                index_posts(new_posts)
+        self.checkpoint.write_text(json.dumps({'offset': offset}))
+
+        self.stats['posts'] += len(new_posts)
+        self.stats['comments'] += len(new_comments)
+        self.stats['existing'] += (
+            len(posts) - len(new_posts) + len(comments) - len(new_comments)
+        )
+        self.stats['skipped'] += len(orphans)
+        for comment in orphans:
+            self.log(
+                f'Комментарий {comment.source_id} пропущен: нет поста '
+                f'{comment.source_post_id}'
+            )
+        rows = self.stats['posts'] + self.stats['comments']
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.log(
+            f'Импортировано строк: {rows} ({rows / elapsed:.0f} строк/с)'
+        )
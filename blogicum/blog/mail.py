@@ -0,0 +1,122 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+
+class EmailQueue:
+    """Очередь писем, которые отправляет пул фоновых потоков.
+
+    Поток забирает из очереди сразу пачку писем и отправляет её через одно
+    соединение с почтовым бэкендом; соединение остаётся открытым, пока в
+    очереди есть письма. При завершении процесса очередь дожидается
+    отправки оставшихся писем.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = []
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def enqueue(self, message):
+        self._start()
+        self._queue.put(message)
+
+    def flush(self, timeout=None):
+        """Ждёт отправки всех писем; возвращает True, если очередь пуста."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = (
+                    None if deadline is None else deadline - time.monotonic()
+                )
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def metrics(self):
+        """Глубина очереди и задержка отправки пачек, в секундах."""
+        with self._lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'sent': self.sent,
+                'failed': self.failed,
+                'batches': self.batches,
+                'avg_send_latency': (
+                    self.total_latency / self.batches if self.batches else 0.0
+                ),
+                'max_send_latency': self.max_latency,
+            }
+
+    def _start(self):
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for number in range(settings.BLOG_EMAIL_WORKERS):
+                thread = threading.Thread(
+                    target=self._work,
+                    name=f'blog-email-{number}',
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+        atexit.register(self.flush, settings.BLOG_EMAIL_FLUSH_TIMEOUT)
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < settings.BLOG_EMAIL_BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _work(self):
+        connection = None
+        while True:
+            batch = self._next_batch()
+            started = time.perf_counter()
+            try:
+                if connection is None:
+                    connection = get_connection(fail_silently=True)
+                    connection.open()
+                sent = connection.send_messages(batch) or 0
+            except Exception:
+                logger.exception('Не удалось отправить пачку писем')
+                sent = 0
+                connection = None
+            if connection is not None and self._queue.empty():
+                connection.close()
+                connection = None
+            self._record(len(batch), sent, time.perf_counter() - started)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _record(self, size, sent, latency):
+        with self._lock:
+            self.sent += sent
+            self.failed += size - sent
+            self.batches += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+        logger.debug(
+            'email batch size=%d sent=%d latency=%.4f queue_depth=%d',
+            size, sent, latency, self._queue.qsize(),
+        )
+
+
+email_queue = EmailQueue()
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from blog.constants import SITEMAP_CHUNK_SIZE
+from blog.sitemaps import build_sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Генерирует файлы карты сайта в BLOG_SITEMAP_ROOT.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=SITEMAP_CHUNK_SIZE,
+            help='Сколько записей читать из базы за один запрос.',
+        )
+        parser.add_argument(
+            '--site-url',
+            help='Адрес сайта для ссылок; по умолчанию BLOG_SITE_URL.',
+        )
+
+    def handle(self, *args, **options):
+        files = build_sitemaps(
+            site_url=options['site_url'], chunk_size=options['chunk_size']
+        )
+        for section, names in files.items():
+            self.stdout.write(f'{section}: файлов {len(names)}')
+        self.stdout.write(self.style.SUCCESS('Карта сайта обновлена'))
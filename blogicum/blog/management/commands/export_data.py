@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.constants import EXPORT_CHUNK_SIZE
+from blog.exporter import EXPORTS, Exporter
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает посты, комментарии, категории, местоположения и '
+        'пользователей в JSONL или CSV. Посты и комментарии выгружаются '
+        'начиная с прошлого запуска, остальные таблицы — целиком.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'tables', nargs='*',
+            help=f'Таблицы для выгрузки: {", ".join(EXPORTS)}; '
+                 'по умолчанию все.',
+        )
+        parser.add_argument(
+            '--format', dest='file_format', choices=('jsonl', 'csv'),
+            default='jsonl',
+        )
+        parser.add_argument(
+            '--gzip', action='store_true', help='Сжимать файлы gzip.',
+        )
+        parser.add_argument(
+            '--output-dir',
+            help='Каталог для файлов; по умолчанию BLOG_EXPORT_ROOT.',
+        )
+        parser.add_argument(
+            '--state-file',
+            help='Файл с отметками прошлой выгрузки; по умолчанию '
+                 '.export_state.json в каталоге выгрузки.',
+        )
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Выгрузить все строки, не глядя на прошлые отметки.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+            help='Сколько строк читать из базы за один запрос.',
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options['tables']) - set(EXPORTS)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные таблицы: {", ".join(sorted(unknown))}'
+            )
+        exporter = Exporter(
+            root=options['output_dir'],
+            file_format=options['file_format'],
+            compress=options['gzip'],
+            chunk_size=options['chunk_size'],
+            state_file=options['state_file'],
+        )
+        results = exporter.export(options['tables'], full=options['full'])
+        for table, (path, count) in results.items():
+            self.stdout.write(f'{table}: строк {count} -> {path}')
+        self.stdout.write(self.style.SUCCESS('Выгрузка завершена'))
@@ -0,0 +1,54 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import django
+from django.core.management.base import BaseCommand
+
+from blog.cache import bump_image_variants_version
+from blog.images import backfill_variants
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии уже загруженных изображений постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Число процессов.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=16,
+            help='Сколько файлов отдавать процессу за раз.'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересоздать уже существующие копии.'
+        )
+
+    def handle(self, *args, **options):
+        names = Post.objects.exclude(image='').order_by().values_list(
+            'image', flat=True
+        ).distinct().iterator()
+        processed = created = failed = 0
+        with ProcessPoolExecutor(
+            max_workers=options['workers'], initializer=django.setup
+        ) as executor:
+            results = executor.map(
+                partial(backfill_variants, force=options['force']),
+                names,
+                chunksize=options['chunk_size'],
+            )
+            for name, count, error in results:
+                processed += 1
+                created += count
+                if error:
+                    failed += 1
+                    self.stderr.write(f'{name}: {error}')
+        if created:
+            bump_image_variants_version()
+        self.stdout.write(self.style.SUCCESS(
+            f'Изображений: {processed}, создано копий: {created}, '
+            f'ошибок: {failed}'
+        ))
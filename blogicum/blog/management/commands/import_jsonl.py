@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from blog.importer import JsonlImporter
+
+
+class Command(BaseCommand):
+    help = (
+        'Импортирует посты и комментарии из JSONL-архива пачками, без '
+        'форм и писем. Прерванный импорт продолжается с контрольной точки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл JSONL.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько строк вставлять в одной транзакции.',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Файл контрольной точки; по умолчанию <path>.checkpoint.',
+        )
+
+    def handle(self, *args, **options):
+        stats = JsonlImporter(
+            options['path'],
+            batch_size=options['batch_size'],
+            checkpoint=options['checkpoint'],
+            log=self.stdout.write,
+        ).run()
+        self.stdout.write(self.style.SUCCESS(
+            f'Постов: {stats["posts"]}, комментариев: {stats["comments"]}, '
+            f'импортированных ранее: {stats["existing"]}, '
+            f'пропущено строк: {stats["skipped"]}'
+        ))
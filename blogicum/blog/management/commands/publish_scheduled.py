@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.publication import next_publication, publish_due_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Публикует отложенные посты, дата публикации которых наступила. '
+        'С --loop работает постоянно и просыпается к ближайшей публикации.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а ждать следующих публикаций.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=60,
+            help='Максимальная пауза между проверками, в секундах.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            published = publish_due_posts()
+            if published or not options['loop']:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Опубликовано постов: {published}')
+                )
+            if not options['loop']:
+                return
+            try:
+                time.sleep(self.pause(options['interval']))
+            except KeyboardInterrupt:
+                return
+
+    def pause(self, interval):
+        scheduled = next_publication()
+        if scheduled is None:
+            return interval
+        seconds = (scheduled - timezone.now()).total_seconds()
+        return min(interval, max(seconds, 0))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.search import rebuild_index, search_available
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс постов.'
+
+    def handle(self, *args, **options):
+        if not search_available():
+            raise CommandError('Полнотекстовый индекс есть только в SQLite.')
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Индекс перестроен.'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.service import published_comment_count
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённые счётчики комментариев у всех постов.'
+
+    def handle(self, *args, **options):
+        updated = Post.objects.update(
+            comment_count=published_comment_count()
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано постов: {updated}')
+        )
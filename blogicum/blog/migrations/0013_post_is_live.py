@@ -0,0 +1,38 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:28
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_is_live(apps, schema_editor):
+    apps.get_model('blog', 'Post').objects.filter(
+        is_published=True, pub_date__lte=timezone.now()
+    ).update(is_live=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_feed_idx',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='is_live',
+            field=models.BooleanField(default=False, editable=False, help_text='Отложенные публикации включает планировщик, когда наступает дата публикации.', verbose_name='Виден в лентах'),
+        ),
+        migrations.RunPython(fill_is_live, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_live', True)), fields=['pub_date'], name='post_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_live', False), ('is_published', True)), fields=['pub_date'], name='post_scheduled_idx'),
+        ),
+    ]
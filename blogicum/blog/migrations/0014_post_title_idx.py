@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_is_live'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['title'], name='post_title_idx'),
+        ),
+    ]
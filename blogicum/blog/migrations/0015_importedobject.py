@@ -0,0 +1,30 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_post_title_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportedObject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=16, verbose_name='Тип')),
+                ('source_id', models.BigIntegerField(verbose_name='Идентификатор в архиве')),
+                ('object_id', models.BigIntegerField(verbose_name='Идентификатор объекта')),
+            ],
+            options={
+                'verbose_name': 'импортированный объект',
+                'verbose_name_plural': 'Импортированные объекты',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importedobject',
+            constraint=models.UniqueConstraint(fields=('kind', 'source_id'), name='imported_object_source_uniq'),
+        ),
+    ]
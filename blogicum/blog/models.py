@@ -1,4 +1,6 @@
-from core.models import CreatedModel, PublishedModel
+import hashlib
+
+from core.models import CreatedModel, PublishedModel, UpdatedModel
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.urls import reverse
@@ -44,7 +46,7 @@ class Location(PublishedModel, CreatedModel):
         return self.name
 
 
-class Post(PublishedModel, CreatedModel):
+class Post(PublishedModel, CreatedModel, UpdatedModel):
     title = models.CharField('Название', max_length=256)
     text = models.TextField('Текст')
     image = models.ImageField('Фото', upload_to='blog_images', blank=True)
@@ -76,18 +78,70 @@ class Post(PublishedModel, CreatedModel):
         blank=True,
     )
 
-    def comment_count(self):
-        return self.comment.count()
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
+    is_live = models.BooleanField(
+        'Виден в лентах',
+        default=False,
+        editable=False,
+        help_text=(
+            'Отложенные публикации включает планировщик, когда наступает '
+            'дата публикации.'
+        ),
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ['-pub_date']
         default_related_name = 'posts'
+        indexes = [
+            models.Index(
+                fields=['pub_date'],
+                name='post_feed_idx',
+                condition=models.Q(is_live=True),
+            ),
+            models.Index(
+                fields=['pub_date'],
+                name='post_scheduled_idx',
+                condition=models.Q(is_published=True, is_live=False),
+            ),
+            models.Index(
+                fields=['category', 'pub_date'],
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=['author', 'pub_date'],
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=['title'],
+                name='post_title_idx',
+            ),
+            models.Index(
+                fields=['updated_at'],
+                name='post_updated_idx',
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
 
     def __str__(self):
         return self.title[:NUMBER_CHARACTERS]
 
+    def save(self, *args, **kwargs):
+        self.is_live = self.is_published and self.pub_date <= timezone.now()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'is_live'}
+        super().save(*args, **kwargs)
+
     def is_visible(self):
         """Проверяет, доступен ли пост для просмотра."""
         return self.is_published or (
@@ -98,8 +152,30 @@ class Post(PublishedModel, CreatedModel):
         """Возвращает канонический URL для просмотра поста."""
         return reverse('blog:post_detail', kwargs={'post_id': self.id})
 
-
-class Comment(PublishedModel, CreatedModel):
+    @property
+    def card_version(self):
+        """Версия карточки поста для кеша: меняется вместе с её содержимым."""
+        parts = (
+            self.title,
+            self.text,
+            self.image.name,
+            str(self.pub_date),
+            self.is_published,
+            self.comment_count,
+            self.author.username,
+        )
+        if self.category_id:
+            parts += (
+                self.category.slug,
+                self.category.title,
+                self.category.is_published,
+            )
+        if self.location_id:
+            parts += (self.location.name, self.location.is_published)
+        return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+class Comment(PublishedModel, CreatedModel, UpdatedModel):
     text = models.TextField('Комментарии')
     post = models.ForeignKey(
         Post,
@@ -117,6 +193,22 @@ class Comment(PublishedModel, CreatedModel):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = [
+            models.Index(
+                fields=['post', 'created_at'],
+                name='comment_post_created_idx',
+            ),
+            models.Index(
+                fields=['updated_at'],
+                name='comment_updated_idx',
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
 
     def __str__(self):
         return (
@@ -133,3 +225,24 @@ class StaticPage(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class ImportedObject(models.Model):
+    """Соответствие идентификатора из архива созданному объекту."""
+
+    kind = models.CharField('Тип', max_length=16)
+    source_id = models.BigIntegerField('Идентификатор в архиве')
+    object_id = models.BigIntegerField('Идентификатор объекта')
+
+    class Meta:
+        verbose_name = 'импортированный объект'
+        verbose_name_plural = 'Импортированные объекты'
+        constraints = (
+            models.UniqueConstraint(
+                fields=['kind', 'source_id'],
+                name='imported_object_source_uniq',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.kind} {self.source_id} -> {self.object_id}'
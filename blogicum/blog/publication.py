@@ -0,0 +1,33 @@
+from core.routers import note_shared_write
+from django.db.models import Min
+from django.utils import timezone
+
+from blog.cache import bump_content_version, invalidate_feed_counts
+from blog.models import Post
+
+
+def scheduled_posts():
+    """Опубликованные автором посты, которые ещё не видны в лентах."""
+    return Post.objects.filter(is_published=True, is_live=False)
+
+
+def next_publication():
+    """Ближайшая дата отложенной публикации или None."""
+    return scheduled_posts().aggregate(Min('pub_date'))['pub_date__min']
+
+
+def publish_due_posts():
+    """Показывает в лентах посты, дата публикации которых наступила.
+
+    Ленты фильтруют посты по флагу is_live, а не по текущему времени,
+    поэтому запросы лент и кеш страниц не меняются между публикациями.
+    """
+    now = timezone.now()
+    published = scheduled_posts().filter(pub_date__lte=now).update(
+        is_live=True, updated_at=now
+    )
+    if published:
+        invalidate_feed_counts()
+        bump_content_version()
+        note_shared_write()
+    return published
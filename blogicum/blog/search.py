@@ -0,0 +1,72 @@
+from django.db import connection
+
+FTS_TABLE = 'blog_post_fts'
+FTS_COLUMNS = ('title', 'text', 'description')
+# Веса столбцов для bm25: совпадение в заголовке важнее, чем в тексте.
+FTS_WEIGHTS = (10.0, 1.0, 4.0)
+
+
+def search_available():
+    return connection.vendor == 'sqlite'
+
+
+def fts_query(query):
+    """Экранирует слова запроса, чтобы спецсимволы FTS5 не ломали MATCH."""
+    words = ['"{}"'.format(word.replace('"', '""')) for word in query.split()]
+    return ' '.join(words)
+
+
+def index_posts(posts):
+    """Добавляет посты в полнотекстовый индекс или обновляет их там."""
+    rows = [
+        (post.pk, *(getattr(post, column) for column in FTS_COLUMNS))
+        for post in posts
+    ]
+    if not rows:
+        return
+    unindex_posts([row[0] for row in rows])
+    with connection.cursor() as cursor:
+        for row in rows:
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, {", ".join(FTS_COLUMNS)}) '
+                'VALUES (%s, %s, %s, %s)',
+                row,
+            )
+
+
+def unindex_posts(post_ids):
+    post_ids = list(post_ids)
+    if not post_ids:
+        return
+    placeholders = ', '.join(['%s'] * len(post_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})',
+            post_ids,
+        )
+
+
+def rebuild_index():
+    """Перестраивает индекс по всей таблице постов."""
+    columns = ', '.join(FTS_COLUMNS)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, {columns}) '
+            f'SELECT id, {columns} FROM blog_post'
+        )
+
+
+def search_post_ids(query, limit):
+    """Идентификаторы подходящих постов, от самых релевантных."""
+    match = fts_query(query)
+    if not match:
+        return []
+    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+            f'ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s',
+            [match, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
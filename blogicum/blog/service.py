@@ -1,8 +1,22 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
-from django.db.models import Count
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.functional import cached_property
+
+from blog.cache import get_feed_count
+from blog.constants import COMMENTS_PER_PAGE, SEARCH_RESULTS_LIMIT
+from blog.models import Comment, Post
+from blog.search import search_available, search_post_ids
 
-from blog.models import Post
+FEED_ORDERING = ('-pub_date', '-id')
+COMMENT_ORDERING = ('created_at', 'id')
 
 
 def get_filter_posts(
@@ -11,18 +25,17 @@ def get_filter_posts(
         category=None,
         unpublished=False,
         not_user=False):
-    """Фильтруем посты по дате, статусу публикации и категории."""
+    """Фильтруем посты по статусу публикации, автору и категории."""
     filters = {}
 
     if not_user:
-        filters['is_published'] = True
-        filters['pub_date__lte'] = timezone.now()
+        filters['is_live'] = True
         filters['category__is_published'] = True
 
     if author:
         filters['author'] = author
         if unpublished:
-            filters.pop('is_published', None)
+            filters.pop('is_live', None)
 
     if location:
         filters['location'] = location
@@ -32,13 +45,242 @@ def get_filter_posts(
 
     posts = Post.objects.select_related(
         'author', 'location', 'category'
-    ).annotate(
-        comment_count=Count('comments')
-    ).filter(**filters).order_by('-pub_date')
+    ).filter(**filters).order_by(*FEED_ORDERING)
 
     return posts
 
 
-def paginate_func(request, queryset, items_per_page):
-    return Paginator(queryset, items_per_page).get_page(
-        request.GET.get('page'))
+def published_comment_count():
+    """Подзапрос с числом опубликованных комментариев поста."""
+    comments = Comment.objects.filter(
+        post=OuterRef('pk'), is_published=True
+    ).order_by().values('post').annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(comments), 0)
+
+
+def refresh_comment_count(*post_ids):
+    """Пересчитывает сохранённый счётчик комментариев у постов.
+
+    Заодно обновляет updated_at: страница поста показывает комментарии,
+    поэтому их изменение меняет и валидаторы условного GET.
+    """
+    post_ids = {post_id for post_id in post_ids if post_id}
+    if post_ids:
+        Post.objects.filter(pk__in=post_ids).update(
+            comment_count=published_comment_count(),
+            updated_at=timezone.now(),
+        )
+
+
+def search_posts(query):
+    """Видимые посты, подходящие под запрос, по убыванию релевантности.
+
+    Совпадения ищутся в полнотекстовом индексе, а затем отсеиваются теми же
+    правилами видимости, что и в публичных лентах.
+    """
+    visible = get_filter_posts(not_user=True)
+    if not search_available():
+        return list(visible.filter(
+            Q(title__icontains=query)
+            | Q(text__icontains=query)
+            | Q(description__icontains=query)
+        ).values_list('id', flat=True)[:SEARCH_RESULTS_LIMIT])
+    post_ids = search_post_ids(query, SEARCH_RESULTS_LIMIT)
+    allowed = set(
+        visible.filter(id__in=post_ids).values_list('id', flat=True)
+    )
+    return [post_id for post_id in post_ids if post_id in allowed]
+
+
+class KeysetPage:
+    """Страница курсорной пагинации: без COUNT(*) и без OFFSET."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Курсорная пагинация по уникальному набору полей сортировки.
+
+    Курсор хранит значения полей сортировки крайнего объекта страницы и
+    направление перехода, поэтому глубина страницы не влияет на стоимость
+    запроса: база делает поиск по индексу вместо пропуска строк.
+    """
+
+    NEXT = 'n'
+    PREVIOUS = 'p'
+
+    def __init__(self, queryset, per_page, ordering=FEED_ORDERING):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [field.lstrip('-') for field in self.ordering]
+
+    def encode_cursor(self, obj, direction):
+        values = [
+            self._field(name).value_to_string(obj) for name in self.fields
+        ]
+        raw = json.dumps([direction, values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Возвращает (направление, значения) или None для битого курсора."""
+        if not cursor:
+            return None
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, raw_values = json.loads(
+                base64.urlsafe_b64decode(padded.encode())
+            )
+            if (
+                direction not in (self.NEXT, self.PREVIOUS)
+                or len(raw_values) != len(self.fields)
+            ):
+                return None
+            values = [
+                self._field(name).to_python(value)
+                for name, value in zip(self.fields, raw_values)
+            ]
+        except (
+            ValueError, TypeError, binascii.Error, ValidationError
+        ):
+            return None
+        return direction, values
+
+    def get_page(self, cursor=None):
+        decoded = self.decode_cursor(cursor)
+        if decoded is None:
+            return self._page_after(None)
+        direction, values = decoded
+        if direction == self.PREVIOUS:
+            return self._page_before(values)
+        return self._page_after(values)
+
+    def _field(self, name):
+        return self.queryset.model._meta.get_field(name)
+
+    def _seek(self, values, backwards):
+        """Условие «строго после курсора» в порядке сортировки."""
+        condition = Q()
+        for index, ordering in enumerate(self.ordering):
+            descending = ordering.startswith('-')
+            lookup = 'gt' if descending == backwards else 'lt'
+            step = Q(**{f'{self.fields[index]}__{lookup}': values[index]})
+            for name, value in zip(self.fields[:index], values[:index]):
+                step &= Q(**{name: value})
+            condition |= step
+        return condition
+
+    def _page_after(self, values):
+        queryset = self.queryset.order_by(*self.ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, backwards=False))
+        rows = list(queryset[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        return KeysetPage(
+            rows,
+            next_cursor=(
+                self.encode_cursor(rows[-1], self.NEXT) if has_next else None
+            ),
+            previous_cursor=(
+                self.encode_cursor(rows[0], self.PREVIOUS)
+                if values is not None and rows else None
+            ),
+        )
+
+    def _page_before(self, values):
+        reverse_ordering = [
+            field[1:] if field.startswith('-') else f'-{field}'
+            for field in self.ordering
+        ]
+        rows = list(
+            self.queryset.order_by(*reverse_ordering).filter(
+                self._seek(values, backwards=True)
+            )[:self.per_page + 1]
+        )
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page][::-1]
+        if not rows:
+            return self._page_after(None)
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode_cursor(rows[-1], self.NEXT),
+            previous_cursor=(
+                self.encode_cursor(rows[0], self.PREVIOUS)
+                if has_previous else None
+            ),
+        )
+
+
+class CachedCountPaginator(Paginator):
+    """Пагинатор, который берёт общее число постов ленты из кеша.
+
+    Счётчик обновляется инкрементально при изменении постов; если он
+    устарел, используется последнее известное (приблизительное) значение.
+    """
+
+    def __init__(self, object_list, per_page, feed, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.feed = feed
+
+    @cached_property
+    def count(self):
+        return get_feed_count(self.feed, self.exact_count)
+
+    def exact_count(self):
+        return super().count
+
+
+def paginate_func(
+        request, queryset, items_per_page, keyset=None, feed=None):
+    """Страница ленты: обычная (page=N) или курсорная (cursor=...).
+
+    Для публичных лент передаётся имя ленты ``feed``: тогда общее число
+    постов берётся из кеша вместо COUNT(*) на каждый запрос.
+    """
+    if keyset is None:
+        keyset = settings.BLOG_KEYSET_PAGINATION
+    if keyset:
+        return KeysetPaginator(queryset, items_per_page).get_page(
+            request.GET.get('cursor'))
+    if feed:
+        paginator = CachedCountPaginator(queryset, items_per_page, feed)
+    else:
+        paginator = Paginator(queryset, items_per_page)
+    return paginator.get_page(request.GET.get('page'))
+
+
+def paginate_comments(post, cursor=None):
+    """Очередная порция комментариев поста по курсору (created_at, id).
+
+    Показываются только опубликованные комментарии — те же, что учитывает
+    ``comment_count``.
+    """
+    return KeysetPaginator(
+        post.comments.filter(is_published=True).select_related('author'),
+        COMMENTS_PER_PAGE,
+        ordering=COMMENT_ORDERING,
+    ).get_page(cursor)
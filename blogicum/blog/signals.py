@@ -0,0 +1,146 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from blog.cache import (adjust_feed_count, bump_content_version,
+                        invalidate_feed_counts)
+from blog.models import Category, Comment, Location, Post
+from blog.search import (FTS_COLUMNS, index_posts, search_available,
+                         unindex_posts)
+from blog.service import refresh_comment_count
+
+User = get_user_model()
+
+_deleting = threading.local()
+
+
+def _deleting_posts():
+    if not hasattr(_deleting, 'post_ids'):
+        _deleting.post_ids = set()
+    return _deleting.post_ids
+
+
+@receiver(pre_delete, sender=Post)
+def mark_post_deleting(sender, instance, **kwargs):
+    """Каскадно удаляемым комментариям незачем пересчитывать пост."""
+    _deleting_posts().add(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def unmark_post_deleting(sender, instance, **kwargs):
+    _deleting_posts().discard(instance.pk)
+
+
+# Сохранения с raw=True (loaddata, импорт архива) обработчики пропускают:
+# счётчики, поисковый индекс и версию кеша импорт обновляет сам по пачкам.
+@receiver(post_save, sender=Comment)
+def update_count_on_comment_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    refresh_comment_count(instance.post_id, loaded.get('post_id'))
+    loaded['post_id'] = instance.post_id
+    instance._loaded_values = loaded
+
+
+@receiver(post_delete, sender=Comment)
+def update_count_on_comment_delete(sender, instance, **kwargs):
+    if instance.post_id not in _deleting_posts():
+        refresh_comment_count(instance.post_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_pages(sender, raw=False, **kwargs):
+    if not raw:
+        bump_content_version()
+
+
+@receiver(post_save, sender=User)
+def invalidate_pages_on_user_change(sender, update_fields=None, **kwargs):
+    """Вход пользователя обновляет только last_login — кеш не трогаем."""
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        bump_content_version()
+
+
+FEED_STATE_FIELDS = ('is_live', 'category_id', 'author_id')
+
+
+def _visible_feeds(state, published_categories):
+    """Ленты, в счётчиках которых учитывается пост с таким состоянием."""
+    is_live, category_id, author_id = state
+    if not (is_live and category_id):
+        return set()
+    if category_id not in published_categories:
+        published_categories[category_id] = Category.objects.filter(
+            pk=category_id, is_published=True
+        ).exists()
+    if not published_categories[category_id]:
+        return set()
+    return {'all', f'category:{category_id}', f'author:{author_id}'}
+
+
+def _post_state(post):
+    return tuple(getattr(post, name) for name in FEED_STATE_FIELDS)
+
+
+@receiver(post_save, sender=Post)
+def update_feed_counts_on_save(sender, instance, created, raw=False,
+                               **kwargs):
+    if raw:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    categories = {}
+    old = set()
+    if not created and all(name in loaded for name in FEED_STATE_FIELDS):
+        old = _visible_feeds(
+            tuple(loaded[name] for name in FEED_STATE_FIELDS), categories
+        )
+    elif not created:
+        invalidate_feed_counts()
+    new = _visible_feeds(_post_state(instance), categories)
+    for feed in new - old:
+        adjust_feed_count(feed, 1)
+    for feed in old - new:
+        adjust_feed_count(feed, -1)
+    loaded.update(zip(FEED_STATE_FIELDS, _post_state(instance)))
+    instance._loaded_values = loaded
+
+
+@receiver(post_delete, sender=Post)
+def update_feed_counts_on_delete(sender, instance, **kwargs):
+    for feed in _visible_feeds(_post_state(instance), {}):
+        adjust_feed_count(feed, -1)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_feed_counts_on_category_change(sender, **kwargs):
+    """Смена категории меняет видимость сразу многих постов."""
+    invalidate_feed_counts()
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, update_fields=None, raw=False,
+                        **kwargs):
+    if raw or not search_available():
+        return
+    if update_fields is not None and not set(update_fields) & set(
+        FTS_COLUMNS
+    ):
+        return
+    index_posts([instance])
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, **kwargs):
+    if search_available():
+        unindex_posts([instance.pk])
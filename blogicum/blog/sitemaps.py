@@ -0,0 +1,141 @@
+import os
+import re
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.constants import SITEMAP_CHUNK_SIZE, SITEMAP_URLS_PER_FILE
+from blog.models import Category
+from blog.service import KeysetPaginator, get_filter_posts
+
+SITEMAP_INDEX = 'sitemap.xml'
+SITEMAP_FILE_NAME = re.compile(r'sitemap-[a-z]+-\d+\.xml')
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+User = get_user_model()
+
+
+def iterate_keyset(queryset, ordering, chunk_size=SITEMAP_CHUNK_SIZE):
+    """Обходит queryset пачками по курсору, не держа в памяти всю выборку."""
+    paginator = KeysetPaginator(queryset, chunk_size, ordering=ordering)
+    page = paginator.get_page()
+    yield from page
+    while page.has_next():
+        page = paginator.get_page(page.next_cursor)
+        yield from page
+
+
+def post_urls(chunk_size=SITEMAP_CHUNK_SIZE):
+    posts = get_filter_posts(not_user=True).select_related(None).only(
+        'id', 'pub_date', 'updated_at'
+    )
+    for post in iterate_keyset(posts, ('pub_date', 'id'), chunk_size):
+        yield post.get_absolute_url(), post.updated_at
+
+
+def category_urls(chunk_size=SITEMAP_CHUNK_SIZE):
+    categories = Category.objects.filter(is_published=True).only(
+        'id', 'slug'
+    )
+    for category in iterate_keyset(categories, ('id',), chunk_size):
+        yield reverse('blog:category_posts', args=[category.slug]), None
+
+
+def profile_urls(chunk_size=SITEMAP_CHUNK_SIZE):
+    users = User.objects.filter(is_active=True).only('id', 'username')
+    for user in iterate_keyset(users, ('id',), chunk_size):
+        yield reverse('blog:profile', args=[user.username]), None
+
+
+SECTIONS = {
+    'posts': post_urls,
+    'categories': category_urls,
+    'profiles': profile_urls,
+}
+
+
+def _url_entry(location, lastmod=None):
+    entry = f'<url><loc>{escape(location)}</loc>'
+    if lastmod:
+        entry += f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+    return entry + '</url>\n'
+
+
+class _SitemapFile:
+    """Файл карты сайта, который пишется построчно во временный файл."""
+
+    def __init__(self, root, name, tag='urlset'):
+        self.path = root / name
+        self.temp_path = root / f'{name}.tmp'
+        self.tag = tag
+        self.file = open(self.temp_path, 'w', encoding='utf-8')
+        self.file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<{tag} xmlns="{SITEMAP_NAMESPACE}">\n'
+        )
+        self.count = 0
+
+    def write(self, entry):
+        self.file.write(entry)
+        self.count += 1
+
+    def close(self):
+        self.file.write(f'</{self.tag}>\n')
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+
+
+def write_section(root, section, urls, site_url,
+                  per_file=SITEMAP_URLS_PER_FILE):
+    """Пишет URL раздела в файлы по per_file штук; возвращает имена."""
+    names = []
+    current = None
+    for location, lastmod in urls:
+        if current is None or current.count >= per_file:
+            if current is not None:
+                current.close()
+            names.append(f'sitemap-{section}-{len(names) + 1}.xml')
+            current = _SitemapFile(root, names[-1])
+        current.write(_url_entry(f'{site_url}{location}', lastmod))
+    if current is not None:
+        current.close()
+    return names
+
+
+def build_sitemaps(root=None, site_url=None, chunk_size=SITEMAP_CHUNK_SIZE,
+                   per_file=SITEMAP_URLS_PER_FILE):
+    """Генерирует индекс и файлы карты сайта на диск.
+
+    Записи читаются курсорными пачками и сразу пишутся в файлы, поэтому
+    расход памяти не зависит от числа постов. Файлы заменяются атомарно,
+    а файлы, оставшиеся от прошлой генерации, удаляются.
+    """
+    root = Path(root or settings.BLOG_SITEMAP_ROOT)
+    site_url = (site_url or settings.BLOG_SITE_URL).rstrip('/')
+    root.mkdir(parents=True, exist_ok=True)
+
+    files = {}
+    for section, urls in SECTIONS.items():
+        files[section] = write_section(
+            root, section, urls(chunk_size), site_url, per_file
+        )
+    names = [name for section in files.values() for name in section]
+
+    lastmod = timezone.now().isoformat(timespec='seconds')
+    index = _SitemapFile(root, SITEMAP_INDEX, tag='sitemapindex')
+    for name in names:
+        location = reverse('blog:sitemap_section', args=[name])
+        index.write(
+            f'<sitemap><loc>{escape(site_url + location)}</loc>'
+            f'<lastmod>{lastmod}</lastmod></sitemap>\n'
+        )
+    index.close()
+
+    for stale in root.glob('sitemap-*.xml'):
+        if stale.name not in names:
+            stale.unlink()
+    return files
@@ -0,0 +1,19 @@
+from django import template
+
+from blog.cache import image_variants_version
+from blog.images import variant_name
+
+register = template.Library()
+
+register.simple_tag(image_variants_version)
+
+
+@register.filter
+def variant(image, name):
+    """URL уменьшенной копии изображения или оригинала, если копии нет."""
+    if not image:
+        return ''
+    target = variant_name(image.name, name)
+    if image.storage.exists(target):
+        return image.storage.url(target)
+    return image.url
@@ -10,6 +10,11 @@ posts_urls = [
     path('<int:post_id>/edit/', views.edit_post, name='edit_post'),
     path('<int:post_id>/delete/', views.delete_post, name='delete_post'),
     path('<int:post_id>/comment/', views.add_comment, name='add_comment'),
+    path(
+        '<int:post_id>/comments/',
+        views.post_comments,
+        name='post_comments'
+    ),
     path(
         '<int:post_id>/edit_comment/<int:comment_id>/',
         views.edit_comment,
@@ -24,12 +29,30 @@ posts_urls = [
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('feed/<str:feed_format>/', views.site_feed, name='site_feed'),
     path('posts/', include(posts_urls)),
     path(
         'category/<slug:category_slug>/',
         views.category_posts,
         name='category_posts'
     ),
+    path(
+        'category/<slug:category_slug>/feed/<str:feed_format>/',
+        views.category_feed,
+        name='category_feed'
+    ),
+    path('search/', views.search, name='search'),
+    path('sitemap.xml', views.sitemap_index, name='sitemap_index'),
+    path(
+        'sitemaps/<str:name>',
+        views.sitemap_section,
+        name='sitemap_section'
+    ),
     path('profile/edit/', views.edit_profile, name='edit_profile'),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path(
+        'profile/<str:username>/feed/<str:feed_format>/',
+        views.author_feed,
+        name='author_feed'
+    ),
 ]
@@ -1,40 +1,100 @@
+from hashlib import md5
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.core.exceptions import PermissionDenied
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import urlencode
+from django.views.decorators.http import condition
+from django.views.static import serve
 
+from blog.cache import (cache_anonymous_page, content_changed_at,
+                        feed_etag, feed_last_modified, get_content_version)
 from blog.constants import NUMBER_POSTS
+from blog.feeds import FEED_FORMATS, feed_response, latest_posts
 from blog.form import CommentForm, PostForm, RegistrationForm
+from blog.images import generate_variants_safely
+from blog.mail import email_queue
 from blog.models import Category, Comment, Post
-from blog.service import get_filter_posts, paginate_func
+from blog.service import (get_filter_posts, paginate_comments, paginate_func,
+                          search_posts)
+from blog.sitemaps import SITEMAP_FILE_NAME, SITEMAP_INDEX
 
 
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+@cache_anonymous_page
 def index(request):
     posts = get_filter_posts(not_user=True)
 
-    page_obj = paginate_func(request, posts, NUMBER_POSTS)
+    page_obj = paginate_func(request, posts, NUMBER_POSTS, feed='all')
     context = {'page_obj': page_obj}
     return render(request, 'blog/index.html', context)
 
 
-def post_detail(request, post_id):
+def get_visible_post(request, post_id):
+    """Пост, который может видеть пользователь, или 404.
+
+    Результат запоминается в запросе: валидаторы условного GET и само
+    представление читают пост одним запросом.
+    """
+    visible_posts = request.__dict__.setdefault('_visible_posts', {})
+    if post_id not in visible_posts:
+        visible_posts[post_id] = _get_visible_post(request, post_id)
+    return visible_posts[post_id]
 
-    post = get_object_or_404(Post, id=post_id)
 
+def _get_visible_post(request, post_id):
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'category', 'location'),
+        id=post_id
+    )
+    # Пост, дата которого наступила, открывается и до того, как
+    # планировщик отметит его is_live и покажет в лентах.
+    is_live = post.is_live or (
+        post.is_published and post.pub_date <= timezone.now()
+    )
     if (
-        not (post.is_published
-             and post.category.is_published
-             and post.pub_date <= timezone.now())
+        not (is_live and post.category.is_published)
         and post.author != request.user
     ):
         raise Http404("Пост не найден.")
+    return post
+
 
-    comments = post.comments.all().order_by('created_at')
+def post_etag(request, post_id):
+    """Значение ETag страницы поста: пост, комментарии и связанные данные.
+
+    updated_at поста меняется при изменении его комментариев, а версия
+    контента — при изменении категорий, местоположений и пользователей,
+    в том числе авторов комментариев.
+    """
+    try:
+        post = get_visible_post(request, post_id)
+    except Http404:
+        return None
+    return md5(
+        f'{get_content_version()}:{post.updated_at.isoformat()}'
+        f':{request.user.pk}:{request.GET.get("comments", "")}'.encode()
+    ).hexdigest()
+
+
+def post_last_modified(request, post_id):
+    try:
+        post = get_visible_post(request, post_id)
+    except Http404:
+        return None
+    return max(post.updated_at, content_changed_at())
+
+
+@condition(etag_func=post_etag, last_modified_func=post_last_modified)
+def post_detail(request, post_id):
+    post = get_visible_post(request, post_id)
+    comments = paginate_comments(post, request.GET.get('comments'))
     form = CommentForm()
     return render(request, 'blog/detail.html', {
         'post': post,
@@ -43,6 +103,18 @@ def post_detail(request, post_id):
     })
 
 
+def post_comments(request, post_id):
+    """Фрагмент со следующей порцией комментариев для подгрузки."""
+    post = get_visible_post(request, post_id)
+    comments = paginate_comments(post, request.GET.get('cursor'))
+    return render(request, 'includes/comment_list.html', {
+        'post': post,
+        'comments': comments,
+    })
+
+
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+@cache_anonymous_page
 def category_posts(request, category_slug):
     category = get_object_or_404(
         Category,
@@ -52,7 +124,9 @@ def category_posts(request, category_slug):
 
     posts = get_filter_posts(category=category, not_user=True)
 
-    page_obj = paginate_func(request, posts, NUMBER_POSTS)
+    page_obj = paginate_func(
+        request, posts, NUMBER_POSTS, feed=f'category:{category.pk}'
+    )
 
     context = {
         'category': category_slug,
@@ -61,6 +135,93 @@ def category_posts(request, category_slug):
     return render(request, 'blog/category.html', context)
 
 
+def get_feed_class(feed_format):
+    try:
+        return FEED_FORMATS[feed_format]
+    except KeyError:
+        raise Http404('Неизвестный формат ленты.')
+
+
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+def site_feed(request, feed_format):
+    def channel():
+        _, posts = latest_posts(get_filter_posts(not_user=True))
+        return 'Блогикум', reverse('blog:index'), 'Новые публикации', posts
+
+    return feed_response(request, get_feed_class(feed_format), channel)
+
+
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+def category_feed(request, category_slug, feed_format):
+    def channel():
+        first, posts = latest_posts(
+            get_filter_posts(not_user=True).filter(
+                category__slug=category_slug
+            )
+        )
+        category = first.category if first else get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+        return (
+            category.title,
+            reverse('blog:category_posts', args=[category.slug]),
+            category.description,
+            posts,
+        )
+
+    return feed_response(request, get_feed_class(feed_format), channel)
+
+
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+def author_feed(request, username, feed_format):
+    def channel():
+        first, posts = latest_posts(
+            get_filter_posts(not_user=True).filter(author__username=username)
+        )
+        author = first.author if first else get_object_or_404(
+            User, username=username
+        )
+        return (
+            f'Публикации @{author.username}',
+            reverse('blog:profile', args=[author.username]),
+            f'Новые публикации пользователя @{author.username}',
+            posts,
+        )
+
+    return feed_response(request, get_feed_class(feed_format), channel)
+
+
+def sitemap_index(request):
+    return serve(
+        request, SITEMAP_INDEX, document_root=settings.BLOG_SITEMAP_ROOT
+    )
+
+
+def sitemap_section(request, name):
+    """Готовый файл карты сайта; файлы пишет команда build_sitemaps."""
+    if not SITEMAP_FILE_NAME.fullmatch(name):
+        raise Http404('Карта сайта не найдена.')
+    return serve(request, name, document_root=settings.BLOG_SITEMAP_ROOT)
+
+
+def search(request):
+    query = request.GET.get('q', '').strip()
+    page_obj = paginate_func(
+        request, search_posts(query) if query else [], NUMBER_POSTS,
+        keyset=False
+    )
+    posts = get_filter_posts(not_user=True).in_bulk(page_obj.object_list)
+    page_obj.object_list = [
+        posts[post_id] for post_id in page_obj.object_list
+        if post_id in posts
+    ]
+    return render(request, 'blog/search.html', {
+        'query': query,
+        'page_obj': page_obj,
+        'page_params': urlencode({'q': query}) + '&',
+    })
+
+
 @login_required(login_url='login')
 def create_post(request):
     form = PostForm(request.POST or None, request.FILES or None)
@@ -69,6 +230,8 @@ def create_post(request):
         post = form.save(commit=False)
         post.author = request.user
         post.save()
+        if post.image:
+            generate_variants_safely(post.image.name)
         confirm_create_post(request.user.email)
         return redirect('blog:profile', username=request.user.username)
 
@@ -85,6 +248,8 @@ def edit_post(request, post_id):
 
     if form.is_valid():
         form.save()
+        if 'image' in form.changed_data and post.image:
+            generate_variants_safely(post.image.name)
         return redirect('blog:post_detail', post_id=post.id)
 
     return render(request, 'blog/create.html', {'form': form, 'post': post})
@@ -109,13 +274,18 @@ def delete_post(request, post_id):
     )
 
 
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+@cache_anonymous_page
 def profile(request, username):
     user_profile = get_object_or_404(User, username=username)
     not_user = request.user != user_profile
 
     posts = get_filter_posts(author=user_profile, not_user=not_user)
 
-    page_obj = paginate_func(request, posts, NUMBER_POSTS)
+    page_obj = paginate_func(
+        request, posts, NUMBER_POSTS,
+        feed=f'author:{user_profile.pk}' if not_user else None
+    )
 
     context = {
         'profile': user_profile,
@@ -193,10 +363,9 @@ def delete_comment(request, post_id, comment_id):
 
 
 def confirm_create_post(email):
-    send_mail(
+    email_queue.enqueue(EmailMessage(
         subject='Привет!',
-        message='Спасибо, что разместил у нас свой пост!',
+        body='Спасибо, что разместил у нас свой пост!',
         from_email=settings.EMAIL_BLOGICUM,
-        recipient_list=[email],
-        fail_silently=True,
-    )
+        to=[email],
+    ))
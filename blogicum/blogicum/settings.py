@@ -21,12 +21,15 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'django_bootstrap5',
     'debug_toolbar',
+    'core.apps.CoreConfig',
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.QueryTimingMiddleware',
+    'core.middleware.ReplicaPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -65,6 +68,23 @@ DATABASES = {
     }
 }
 
+# Псевдонимы баз из DATABASES, которые служат репликами для чтения.
+DATABASE_REPLICAS = []
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
+# Сколько секунд после записи чтения пользователя идут в основную базу.
+REPLICA_PIN_SECONDS = 5
+
+# Применяются к каждому новому соединению SQLite (см. core.db).
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'cache_size': -20000,  # в КиБ, около 20 МБ
+    'mmap_size': 134217728,  # 128 МБ
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -117,3 +137,34 @@ LOGIN_REDIRECT_URL = 'blog:index'
 LOGIN_URL = 'login'
 
 EMAIL_BLOGICUM = 'confirm_form@blogicum.ru'
+
+BLOG_KEYSET_PAGINATION = False
+
+BLOG_EMAIL_WORKERS = 1
+
+BLOG_EMAIL_BATCH_SIZE = 50
+
+BLOG_EMAIL_FLUSH_TIMEOUT = 10
+
+BLOG_SITE_URL = os.getenv('BLOG_SITE_URL', 'http://127.0.0.1:8000')
+
+BLOG_SITEMAP_ROOT = BASE_DIR / 'sitemaps'
+
+BLOG_EXPORT_ROOT = BASE_DIR / 'exports'
+
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blogicum.requests': {
+            'handlers': ['console'],
+            'level': os.getenv('BLOG_REQUEST_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
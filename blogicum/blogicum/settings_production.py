@@ -0,0 +1,119 @@
+"""Настройки для продакшена.
+
+Выбираются переменной окружения
+``DJANGO_SETTINGS_MODULE=blogicum.settings_production``; секретный ключ
+и список хостов тоже задаются через окружение.
+"""
+import os
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, INSTALLED_APPS, MIDDLEWARE
+
+DEBUG_APPS = ('debug_toolbar',)
+
+DEBUG = os.getenv('DJANGO_DEBUG', '') == '1'
+
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Задайте переменную DJANGO_SECRET_KEY.')
+
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.getenv('DJANGO_ALLOWED_HOSTS', 'localhost').split(',')
+    if host.strip()
+]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in DEBUG_APPS]
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware.split('.')[0] not in DEBUG_APPS
+]
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('DJANGO_DB_PATH', BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': int(os.getenv('DJANGO_CONN_MAX_AGE', 600)),
+    }
+}
+
+# Файлы реплик через запятую; в тестах они подменяются основной базой.
+DATABASE_REPLICAS = []
+for number, path in enumerate(
+    filter(None, os.getenv('DJANGO_DB_REPLICAS', '').split(',')), 1
+):
+    alias = f'replica{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': path.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+REPLICA_PIN_SECONDS = int(os.getenv('DJANGO_REPLICA_PIN_SECONDS', 5))
+
+# В кеше лежат целые страницы, карточки постов, счётчики лент и версия
+# контента (см. blog.cache). Версия и счётчики меняются через incr, и
+# гарантии сброса страниц и точности счётчиков держатся, только если
+# incr атомарен и общий для всех процессов. Поэтому по умолчанию кеш —
+# memcached (DJANGO_CACHE_LOCATION, по умолчанию 127.0.0.1:11211).
+# Файловый кеш (DJANGO_CACHE_BACKEND со значением FILE_CACHE_BACKEND)
+# оставлен как запасной вариант для одного процесса без memcached: его
+# incr — это чтение и запись, а при каждой записи он просматривает весь
+# каталог.
+MEMCACHED_BACKEND = 'django.core.cache.backends.memcached.PyMemcacheCache'
+FILE_CACHE_BACKEND = 'django.core.cache.backends.filebased.FileBasedCache'
+
+CACHE_BACKEND = os.getenv('DJANGO_CACHE_BACKEND', MEMCACHED_BACKEND)
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.getenv(
+            'DJANGO_CACHE_LOCATION',
+            os.path.join(tempfile.gettempdir(), 'blogicum-cache')
+            if CACHE_BACKEND == FILE_CACHE_BACKEND else '127.0.0.1:11211',
+        ),
+        'TIMEOUT': 900,
+    }
+}
+
+if CACHE_BACKEND == FILE_CACHE_BACKEND:
+    # При 300 записях по умолчанию файловый кеш постоянно удалял бы треть
+    # записей, включая ключ версии контента.
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': int(os.getenv('DJANGO_CACHE_MAX_ENTRIES', 50000)),
+    }
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+STATIC_ROOT = os.getenv('DJANGO_STATIC_ROOT', BASE_DIR / 'static')
+
+EMAIL_BACKEND = os.getenv(
+    'DJANGO_EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend'
+)
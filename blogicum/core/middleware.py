@@ -0,0 +1,148 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from core.routers import pin_to_primary, shared_write_is_recent
+
+logger = logging.getLogger('blogicum.requests')
+
+PIN_COOKIE = 'pin_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class QueryStats:
+    """Обёртка выполнения SQL: считает запросы и время в базе."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class QueryTimingMiddleware:
+    """Число SQL-запросов и время в базе для каждого запроса.
+
+    Метрики отдаются в заголовке ``Server-Timing`` и пишутся одной строкой
+    в лог ``blogicum.requests`` вместе с именем представления. В отличие
+    от debug toolbar, SQL не сохраняется и не форматируется, поэтому
+    middleware можно держать включённым в продакшене.
+
+    Потоковые ответы (ленты RSS/Atom) читают базу уже после того, как
+    отдан заголовок: в ``Server-Timing`` попадает только работа до начала
+    потока, а строка лога пишется после его окончания и учитывает все
+    запросы.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        started = time.perf_counter()
+        with self.measure(stats):
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        response['Server-Timing'] = (
+            f'db;desc="{stats.count} queries";dur={stats.duration * 1000:.1f}'
+            f', total;dur={total * 1000:.1f}'
+        )
+        if response.streaming:
+            response.streaming_content = self.stream(
+                response.streaming_content, request, response, stats, started
+            )
+        else:
+            self.log(request, response, stats, total)
+        return response
+
+    @staticmethod
+    def measure(stats):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        return stack
+
+    def stream(self, content, request, response, stats, started):
+        try:
+            with self.measure(stats):
+                yield from content
+        finally:
+            self.log(
+                request, response, stats, time.perf_counter() - started
+            )
+
+    @staticmethod
+    def log(request, response, stats, total):
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+        logger.info(
+            'method=%s path=%s view=%s status=%s queries=%d db_ms=%.1f'
+            ' total_ms=%.1f',
+            request.method, request.path, view_name, response.status_code,
+            stats.count, stats.duration * 1000, total * 1000,
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'view_name': view_name,
+                'status_code': response.status_code,
+                'queries': stats.count,
+                'db_ms': round(stats.duration * 1000, 1),
+                'total_ms': round(total * 1000, 1),
+            },
+        )
+
+
+class ReplicaPinMiddleware:
+    """Чтение своих записей при работе с репликами.
+
+    Запросы, меняющие данные, целиком работают с основной базой и ставят
+    cookie на ``REPLICA_PIN_SECONDS`` секунд. Пока cookie действует,
+    чтения этого пользователя тоже идут в основную базу, так что
+    реплики успевают догнать её до того, как он снова читает с них.
+    Чтения всех пользователей закрепляются только на столько же после
+    отметки ``note_shared_write`` — её ставят публикация и импорт.
+    Окно должно быть больше отставания реплик.
+    Потоковые ответы читают базу уже после выхода из представления,
+    поэтому закрепление действует и на время чтения потока.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        writes = request.method not in SAFE_METHODS
+        pinned = (
+            writes or PIN_COOKIE in request.COOKIES
+            or shared_write_is_recent()
+        )
+        with pin_to_primary(pinned):
+            response = self.get_response(request)
+        if pinned and response.streaming:
+            response.streaming_content = self.stream(
+                response.streaming_content
+            )
+        if writes:
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    @staticmethod
+    def stream(content):
+        with pin_to_primary():
+            yield from content
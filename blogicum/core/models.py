@@ -21,3 +21,24 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class ModifiedAtField(models.DateTimeField):
+    """Дата последнего изменения: DateTimeField с auto_now.
+
+    Отдельный класс поля отличает дату изменения от даты создания там, где
+    поля модели сопоставляются по типу.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('auto_now', True)
+        super().__init__(*args, **kwargs)
+
+
+class UpdatedModel(models.Model):
+    """Абстрактная модель. Добавляет updated_at."""
+
+    updated_at = ModifiedAtField('Изменено')
+
+    class Meta:
+        abstract = True
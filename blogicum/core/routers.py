@@ -0,0 +1,76 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_pinned = ContextVar('pinned_to_primary', default=False)
+
+RECENT_WRITE_KEY = 'core:recent_primary_write'
+
+
+@contextmanager
+def pin_to_primary(pinned=True):
+    """Направляет чтения внутри блока в основную базу."""
+    token = _pinned.set(pinned)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+def note_shared_write():
+    """Отмечает запись, после которой всем стоит читать из основной базы.
+
+    Нужна для записей без запроса пользователя, которые меняют сразу
+    много общих страниц (отложенная публикация, импорт архива): иначе
+    первые запросы прочитают устаревшие строки с отстающей реплики и
+    сохранят их в кеш под новой версией. Обычные правки закрепляют за
+    основной базой только своего автора. Отметка живёт
+    ``REPLICA_PIN_SECONDS`` секунд.
+    """
+    if settings.DATABASE_REPLICAS:
+        cache.set(RECENT_WRITE_KEY, True, settings.REPLICA_PIN_SECONDS)
+
+
+def shared_write_is_recent():
+    return cache.get(RECENT_WRITE_KEY, False)
+
+
+class PrimaryReplicaRouter:
+    """Запись — в основную базу, чтение — в случайную реплику.
+
+    Чтение остаётся в основной базе, если реплики не настроены, если
+    запрос закреплён за ней (см. ``pin_to_primary`` и
+    ``ReplicaPinMiddleware``) или если в основной базе открыта
+    транзакция: внутри неё нужно видеть собственные изменения.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            not replicas or is_pinned()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,11 @@
+// Применяет фильтр админки сразу после выбора записи в автодополнении.
+django.jQuery(document).on('change', '[data-autocomplete-filter]', function () {
+  var params = new URLSearchParams(window.location.search);
+  params.delete('p');
+  if (this.value) {
+    params.set(this.name, this.value);
+  } else {
+    params.delete(this.name);
+  }
+  window.location.search = params.toString();
+});
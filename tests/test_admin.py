@@ -0,0 +1,119 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def change_page_queries(admin_client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    return response, len(queries)
+
+
+def test_category_change_page_is_bounded(mixer, admin_client, user):
+    category = mixer.blend("blog.Category")
+    url = f"/admin/blog/category/{category.id}/change/"
+    mixer.blend("blog.Post", category=category, author=user)
+    admin_client.get(url)
+    _, few = change_page_queries(admin_client, url)
+
+    mixer.cycle(30).blend("blog.Post", category=category, author=user)
+    response, many = change_page_queries(admin_client, url)
+
+    assert few == many, (
+        "Убедитесь, что число запросов страницы категории в админке не "
+        "зависит от числа её публикаций."
+    )
+    content = response.content.decode()
+    assert "<select" not in content
+    assert f"?category__id__exact={category.id}" in content
+    assert content.count("/change/\">") == 10, (
+        "Убедитесь, что на странице категории показаны только последние "
+        "публикации."
+    )
+
+
+def changelist_queries(admin_client):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get("/admin/blog/post/")
+    assert response.status_code == 200
+    return len(queries)
+
+
+def test_post_changelist_query_budget(
+    mixer, admin_client, django_assert_max_num_queries
+):
+    categories = mixer.cycle(5).blend("blog.Category")
+
+    def blend_posts(count):
+        mixer.cycle(count).blend(
+            "blog.Post",
+            author=mixer.sequence(*mixer.cycle(count).blend("auth.User")),
+            location=mixer.sequence(
+                *mixer.cycle(count).blend("blog.Location")
+            ),
+            category=mixer.sequence(*categories),
+        )
+
+    blend_posts(10)
+    admin_client.get("/admin/blog/post/")
+    few = changelist_queries(admin_client)
+
+    blend_posts(90)
+    many = changelist_queries(admin_client)
+
+    assert few == many, (
+        "Убедитесь, что число запросов списка публикаций в админке не "
+        "зависит от числа строк на странице."
+    )
+    # Сессия, пользователь, два COUNT постов, строки страницы, фильтр и
+    # общие для list_editable варианты категорий.
+    with django_assert_max_num_queries(8):
+        admin_client.get("/admin/blog/post/")
+
+
+def test_comment_changelist_filters_load_on_demand(
+    mixer, admin_client, user
+):
+    posts = mixer.cycle(20).blend("blog.Post", author=user)
+    comment = mixer.blend("blog.Comment", post=posts[0], author=user)
+
+    response = admin_client.get("/admin/blog/comment/")
+    content = response.content.decode()
+    assert "data-autocomplete-filter" in content
+    assert posts[-1].title not in content, (
+        "Убедитесь, что фильтр комментариев по постам не выводит все посты."
+    )
+
+    response = admin_client.get(
+        f"/admin/blog/comment/?post__id__exact={posts[1].id}"
+    )
+    assert response.context["cl"].result_count == 0
+
+    response = admin_client.get(
+        "/admin/autocomplete/", {
+            "term": posts[0].title[:3], "app_label": "blog",
+            "model_name": "comment", "field_name": "post",
+        },
+    )
+    assert str(posts[0].id) in [row["id"] for row in response.json()["results"]]
+
+    prefix = comment.author.username[:3]
+    response = admin_client.get("/admin/blog/comment/", {"q": prefix})
+    assert list(response.context["cl"].result_list) == [comment]
+    response = admin_client.get(
+        "/admin/blog/comment/", {"q": comment.author.username[1:]}
+    )
+    assert not response.context["cl"].result_list, (
+        "Убедитесь, что поиск комментариев идёт по началу имени автора."
+    )
+
+
+def test_post_changelist_search_is_unchanged(mixer, admin_client, user):
+    post = mixer.blend("blog.Post", author=user, title="Заметки о маяке")
+    response = admin_client.get("/admin/blog/post/", {"q": "маяке"})
+    assert list(response.context["cl"].result_list) == [post], (
+        "Убедитесь, что поиск в списке публикаций ищет по подстроке."
+    )
@@ -0,0 +1,167 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.cache import get_feed_count, image_variants_version
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def card_key(post):
+    post = Post.objects.select_related(
+        "author", "category", "location"
+    ).get(pk=post.pk)
+    return make_template_fragment_key(
+        "post_card",
+        [post.id, post.card_version, image_variants_version()],
+    )
+
+
+def test_post_card_is_cached_and_shared(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+    assert cache.get(card_key(post)) is not None, (
+        "Убедитесь, что карточка поста кешируется."
+    )
+    cached = cache.get(card_key(post))
+    user_client.get(f"/category/{post.category.slug}/")
+    assert cache.get(card_key(post)) == cached
+
+
+@pytest.mark.parametrize("change", ["category", "location", "author",
+                                    "comment"])
+def test_post_card_version_follows_related_changes(
+    mixer, user, post_with_published_location, change
+):
+    post = post_with_published_location
+    key = card_key(post)
+    if change == "category":
+        post.category.title = "Новая категория"
+        post.category.save()
+    elif change == "location":
+        post.location.name = "Новое место"
+        post.location.save()
+    elif change == "author":
+        post.author.username = "renamed"
+        post.author.save()
+    else:
+        mixer.blend(Comment, post=post, author=user)
+    assert card_key(post) != key, (
+        "Убедитесь, что кеш карточки сбрасывается при изменении связанных"
+        " данных."
+    )
+
+
+def test_anonymous_page_is_cached(
+    client, django_assert_num_queries, post_with_published_location
+):
+    first = client.get("/")
+    with django_assert_num_queries(0):
+        second = client.get("/")
+    assert second.content == first.content, (
+        "Убедитесь, что главная страница кешируется для анонимных"
+        " пользователей."
+    )
+
+
+def test_page_cache_is_keyed_by_page(
+    client, many_posts_with_published_locations
+):
+    first = client.get("/")
+    second = client.get("/?page=2")
+    assert first.content != second.content
+
+
+def test_authenticated_user_bypasses_page_cache(
+    client, user_client, post_with_published_location
+):
+    client.get("/")
+    response = user_client.get("/")
+    assert "Выйти" in response.content.decode(), (
+        "Убедитесь, что авторизованные пользователи не получают страницу из"
+        " кеша анонимных."
+    )
+
+
+def test_page_cache_invalidated_on_post_change(
+    client, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+    post.title = "Изменённый заголовок"
+    post.save()
+    assert "Изменённый заголовок" in client.get("/").content.decode()
+
+
+def test_page_cache_invalidated_when_scheduled_post_goes_live(
+    client, monkeypatch, mixer, user, published_category
+):
+    now = timezone.now()
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        title="Отложенный пост",
+        pub_date=now + timedelta(hours=1),
+    )
+    assert "Отложенный пост" not in client.get("/").content.decode()
+
+    monkeypatch.setattr(timezone, "now", lambda: now + timedelta(hours=2))
+    assert "Отложенный пост" not in client.get("/").content.decode(), (
+        "Убедитесь, что запрос ленты сам не публикует отложенные посты."
+    )
+    call_command("publish_scheduled", stdout=StringIO())
+    assert "Отложенный пост" in client.get("/").content.decode(), (
+        "Убедитесь, что отложенный пост появляется в ленте после запуска"
+        " планировщика."
+    )
+
+
+def cached_count(feed):
+    def fail():
+        raise AssertionError(
+            "Убедитесь, что число постов ленты берётся из кеша."
+        )
+    return get_feed_count(feed, fail)
+
+
+def test_feed_counts_are_cached_and_incremental(
+    user_client, mixer, user, published_category, post_with_published_location
+):
+    category_feed = f"category:{published_category.pk}"
+    user_client.get("/")
+    user_client.get(f"/category/{published_category.slug}/")
+    assert cached_count("all") == 1
+
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category
+    )
+    assert cached_count("all") == 2
+    assert cached_count(category_feed) == 2
+
+    post.is_published = False
+    post.save()
+    assert cached_count("all") == 1
+
+    post_with_published_location.delete()
+    assert cached_count("all") == 0
+    assert cached_count(category_feed) == 0
+
+
+def test_stale_feed_count_is_recounted(
+    user_client, mixer, user, published_category, post_with_published_location
+):
+    user_client.get("/")
+    published_category.is_published = False
+    published_category.save()
+    assert get_feed_count("all", lambda: 0) == 0, (
+        "Убедитесь, что устаревший счётчик ленты пересчитывается."
+    )
@@ -0,0 +1,80 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_of(post):
+    return Post.objects.values_list("comment_count", flat=True).get(
+        pk=post.pk
+    )
+
+
+def test_comment_count_follows_comment_changes(
+    mixer, user, post_with_published_location, post_of_another_author
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend(Comment, post=post, author=user)
+    assert count_of(post) == 3, (
+        "Убедитесь, что счётчик комментариев поста растёт при создании"
+        " комментария."
+    )
+
+    comments[0].delete()
+    assert count_of(post) == 2
+
+    comments[1].is_published = False
+    comments[1].save()
+    assert count_of(post) == 1, (
+        "Убедитесь, что снятые с публикации комментарии не учитываются в"
+        " счётчике."
+    )
+
+    moved = Comment.objects.get(pk=comments[2].pk)
+    moved.post = post_of_another_author
+    moved.save()
+    assert count_of(post) == 0
+    assert count_of(post_of_another_author) == 1
+
+
+def test_comment_count_survives_cascade(mixer, user, another_user,
+                                        post_with_published_location):
+    post = post_with_published_location
+    mixer.blend(Comment, post=post, author=user)
+    mixer.blend(Comment, post=post, author=another_user)
+    another_user.delete()
+    assert count_of(post) == 1
+
+    post.delete()
+    assert not Comment.objects.exists()
+
+
+def test_recount_comments_command(mixer, user, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend(Comment, post=post, author=user)
+    Post.objects.update(comment_count=0)
+
+    call_command("recount_comments", stdout=StringIO())
+    assert count_of(post) == 2
+
+
+def test_detail_page_shows_counted_comments(
+    mixer, user, client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend(Comment, post=post, author=user, text="Видимый")
+    mixer.blend(
+        Comment, post=post, author=user, text="Скрытый", is_published=False
+    )
+
+    response = client.get(f"/posts/{post.pk}/")
+    comments = list(response.context["comments"])
+    assert [comment.text for comment in comments] == ["Видимый"], (
+        "Убедитесь, что на странице поста показываются только опубликованные"
+        " комментарии."
+    )
+    assert count_of(post) == len(comments)
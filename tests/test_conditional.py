@@ -0,0 +1,84 @@
+import pytest
+
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_feed_answers_not_modified(
+    client, django_assert_num_queries, post_with_published_location
+):
+    response = client.get("/")
+    etag = response["ETag"]
+    assert response.has_header("Last-Modified")
+
+    with django_assert_num_queries(0):
+        response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что неизменённая лента отдаётся с кодом 304 без"
+        " запросов к базе."
+    )
+
+    post = post_with_published_location
+    post.title = "Новый заголовок"
+    post.save()
+    response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+def test_feed_etag_depends_on_user(
+    client, user_client, post_with_published_location
+):
+    assert client.get("/")["ETag"] != user_client.get("/")["ETag"]
+
+
+def test_post_detail_validators(
+    user, user_client, another_user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    response = another_user_client.get(url)
+    etag = response["ETag"]
+    last_modified = response["Last-Modified"]
+
+    response = another_user_client.get(
+        url, HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=last_modified
+    )
+    assert response.status_code == 304
+
+    Comment.objects.create(
+        post=post_with_published_location, author=user, text="Новый"
+    )
+    response = another_user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что новый комментарий меняет ETag страницы поста."
+    )
+
+
+def test_hidden_post_has_no_validators(
+    another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f"/posts/{post.id}/")
+    assert response.status_code == 404
+    assert not response.has_header("ETag")
+
+
+def test_post_detail_etag_follows_commenter_rename(
+    mixer, another_user, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend(Comment, post=post, author=another_user)
+    url = f"/posts/{post.id}/"
+    etag = another_user_client.get(url)["ETag"]
+
+    another_user.username = "renamed"
+    another_user.save()
+    response = another_user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что переименование автора комментария меняет ETag "
+        "страницы поста."
+    )
+    assert "renamed" in response.content.decode()
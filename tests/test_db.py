@@ -0,0 +1,18 @@
+import pytest
+from django.db import connection
+
+pytestmark = [pytest.mark.django_db]
+
+
+def pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+def test_sqlite_pragmas_applied(settings):
+    assert pragma("busy_timeout") == settings.SQLITE_PRAGMAS["busy_timeout"]
+    assert pragma("synchronous") == 1, (
+        "Убедитесь, что соединения SQLite открываются с synchronous=NORMAL."
+    )
+    assert pragma("cache_size") == settings.SQLITE_PRAGMAS["cache_size"]
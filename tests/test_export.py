@@ -0,0 +1,94 @@
+import csv
+import gzip
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.exporter import Exporter
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_export_is_incremental(tmp_path, mixer, user):
+    posts = mixer.cycle(3).blend("blog.Post", author=user)
+    exporter = Exporter(root=tmp_path)
+    first = exporter.export(["posts", "users"])
+
+    path, count = first["posts"]
+    assert count == 3
+    rows = read_jsonl(path)
+    assert {row["id"] for row in rows} == {post.id for post in posts}
+    assert "password" not in read_jsonl(first["users"][0])[0], (
+        "Убедитесь, что выгрузка пользователей не содержит хеши паролей."
+    )
+
+    changed = posts[0]
+    changed.title = "Новое название"
+    changed.save()
+    second = exporter.export(
+        ["posts"], until=timezone.now() + timedelta(seconds=1)
+    )
+    path, count = second["posts"]
+    assert count == 1, (
+        "Убедитесь, что повторная выгрузка содержит только изменённые "
+        "с прошлого запуска строки."
+    )
+    assert read_jsonl(path)[0]["title"] == "Новое название"
+
+
+def test_export_data_command_csv_gzip(tmp_path, mixer, user):
+    mixer.cycle(2).blend("blog.Post", author=user)
+    out = StringIO()
+    call_command(
+        "export_data", "posts", "--format", "csv", "--gzip",
+        "--output-dir", str(tmp_path), stdout=out,
+    )
+    [path] = tmp_path.glob("posts-*.csv.gz")
+    with gzip.open(path, "rt", encoding="utf-8") as source:
+        rows = list(csv.DictReader(source))
+    assert len(rows) == Post.objects.count()
+    assert (tmp_path / ".export_state.json").exists()
+    assert "строк 2" in out.getvalue()
+
+
+def test_export_catches_edits_and_late_rows(tmp_path, mixer, user):
+    post = mixer.blend("blog.Post", author=user)
+    comment, _ = mixer.cycle(2).blend("blog.Comment", post=post, author=user)
+    exporter = Exporter(root=tmp_path)
+    until = timezone.now() + timedelta(seconds=1)
+    exporter.export(["posts", "comments", "users"], until=until)
+
+    comment.is_published = False
+    comment.save()
+    user.email = "new@example.com"
+    user.save()
+    late = mixer.blend("blog.Post", author=user)
+    Post.objects.filter(pk=late.pk).update(
+        updated_at=until - timedelta(seconds=30)
+    )
+    results = exporter.export(
+        ["posts", "comments", "users"], until=until + timedelta(seconds=2)
+    )
+
+    rows = read_jsonl(results["comments"][0])
+    assert [row["id"] for row in rows] == [comment.id], (
+        "Убедитесь, что повторно выгружаются только изменённые комментарии,"
+        " а не вся ветка поста."
+    )
+    assert not rows[0]["is_published"]
+    emails = {row["email"] for row in read_jsonl(results["users"][0])}
+    assert "new@example.com" in emails
+    posts = {row["id"] for row in read_jsonl(results["posts"][0])}
+    assert late.id in posts, (
+        "Убедитесь, что строки, закоммиченные после прошлой выгрузки с"
+        " более ранней датой, не теряются."
+    )
@@ -0,0 +1,75 @@
+from xml.etree import ElementTree
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def read(response):
+    if response.streaming:
+        return b"".join(response.streaming_content)
+    return response.content
+
+
+@pytest.mark.parametrize("feed_format", ["rss", "atom"])
+def test_site_feed_lists_visible_posts(
+    client, feed_format, post_with_published_location,
+    posts_with_unpublished_category, future_posts
+):
+    response = client.get(f"/feed/{feed_format}/")
+    assert response.status_code == 200
+    root = ElementTree.fromstring(read(response))
+    if feed_format == "rss":
+        titles = [item.findtext("title") for item in root.iter("item")]
+    else:
+        titles = [
+            entry.findtext(f"{ATOM}title")
+            for entry in root.iter(f"{ATOM}entry")
+        ]
+    assert titles == [post_with_published_location.title], (
+        "Убедитесь, что в ленту попадают только опубликованные посты из"
+        " опубликованных категорий."
+    )
+
+
+def test_feed_is_cached_and_invalidated(
+    client, django_assert_num_queries, post_with_published_location
+):
+    first = read(client.get("/feed/rss/"))
+    with django_assert_num_queries(0):
+        assert client.get("/feed/rss/").content == first
+
+    post = post_with_published_location
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in read(client.get("/feed/rss/")).decode()
+
+
+def test_category_and_author_feeds(
+    client, django_assert_num_queries, post_with_published_location
+):
+    post = post_with_published_location
+    read(client.get("/feed/rss/"))
+    with django_assert_num_queries(1):
+        category_feed = read(
+            client.get(f"/category/{post.category.slug}/feed/atom/")
+        ).decode()
+    author_feed = read(
+        client.get(f"/profile/{post.author.username}/feed/rss/")
+    ).decode()
+    assert post.title in category_feed
+    assert post.title in author_feed
+
+    assert client.get("/category/missing/feed/rss/").status_code == 404
+    assert client.get("/feed/json/").status_code == 404
+
+
+def test_feed_conditional_get(client, post_with_published_location):
+    response = client.get("/feed/atom/")
+    read(response)
+    response = client.get(
+        "/feed/atom/", HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+    assert response.status_code == 304
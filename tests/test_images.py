@@ -0,0 +1,95 @@
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
+
+from blog.cache import image_variants_version
+from blog.images import generate_variants, variant_name
+from blog.models import Post
+from blog.templatetags.blog_images import variant
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    with override_settings(MEDIA_ROOT=tmp_path):
+        yield tmp_path
+
+
+@pytest.fixture
+def large_post(mixer, user, media_root):
+    buffer = BytesIO()
+    Image.new("RGBA", (2400, 1200), color=(73, 109, 137, 255)).save(
+        buffer, "PNG"
+    )
+    post = mixer.blend("blog.Post", author=user, image=None)
+    post.image.save("large.png", ContentFile(buffer.getvalue()))
+    return post
+
+
+def test_generate_variants_fits_bounding_box(large_post):
+    assert generate_variants(large_post.image.name) == 2
+    with default_storage.open(
+        variant_name(large_post.image.name, "card")
+    ) as card:
+        assert Image.open(card).size == (640, 320), (
+            "Убедитесь, что копия для карточки уменьшается с сохранением"
+            " пропорций."
+        )
+    assert generate_variants(large_post.image.name) == 0
+
+
+def test_variant_filter_prefers_generated_copy(large_post):
+    assert variant(large_post.image, "card") == large_post.image.url
+    generate_variants(large_post.image.name)
+    assert variant(large_post.image, "card").endswith("/card/large.png.jpg")
+
+
+def test_variant_name_keeps_source_extension():
+    assert variant_name("blog_images/x.png", "card") != variant_name(
+        "blog_images/x.jpg", "card"
+    ), "Убедитесь, что у изображений с разными расширениями разные копии."
+
+
+def test_generate_thumbnails_command(large_post):
+    version = image_variants_version()
+    stdout = StringIO()
+    call_command("generate_thumbnails", workers=1, stdout=stdout)
+    assert "создано копий: 2" in stdout.getvalue()
+    assert default_storage.exists(
+        variant_name(large_post.image.name, "detail")
+    )
+    assert image_variants_version() != version, (
+        "Убедитесь, что после создания копий карточки постов сбрасываются."
+    )
+
+
+def test_broken_image_does_not_break_post_creation(
+    mixer, user_client, media_root, caplog
+):
+    category = mixer.blend("blog.Category", is_published=True)
+    buffer = BytesIO()
+    Image.effect_noise((600, 400), 50).convert("RGB").save(buffer, "JPEG")
+    truncated = buffer.getvalue()[:len(buffer.getvalue()) // 2]
+    response = user_client.post("/posts/create/", {
+        "title": "Пост с битым фото",
+        "text": "Текст",
+        "pub_date": "2020-01-01T10:00",
+        "category": category.pk,
+        "image": SimpleUploadedFile(
+            "broken.jpg", truncated, content_type="image/jpeg"
+        ),
+    })
+    assert response.status_code == 302, (
+        "Убедитесь, что пост с изображением, которое не удалось уменьшить,"
+        " сохраняется без ошибки сервера."
+    )
+    post = Post.objects.get(title="Пост с битым фото")
+    assert variant(post.image, "card") == post.image.url
+    assert "broken" in caplog.text
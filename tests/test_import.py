@@ -0,0 +1,150 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.importer import JsonlImporter, imported_ids
+from blog.models import Comment, Post
+from blog.service import search_posts
+
+pytestmark = [pytest.mark.django_db]
+
+ROWS = [
+    {
+        "type": "post", "id": 501, "title": "Архивный пост",
+        "text": "Старый текст про маяк", "author": "archivist",
+        "category": "archive", "location": "Маяк",
+        "pub_date": "2015-03-01T10:00:00", "created_at": "2015-02-28T09:00:00",
+    },
+    {
+        "type": "post", "id": 502, "title": "Скрытый пост", "text": "Текст",
+        "author": "archivist", "category": "archive", "is_published": False,
+        "pub_date": "2015-03-02T10:00:00",
+    },
+    {
+        "type": "comment", "id": 901, "post": 501, "author": "reader",
+        "text": "Первый", "created_at": "2015-03-01T11:00:00",
+    },
+    {
+        "type": "comment", "id": 902, "post": 501, "author": "reader",
+        "text": "Второй", "created_at": "2015-03-01T12:00:00",
+    },
+    {
+        "type": "comment", "id": 903, "post": 999, "author": "reader",
+        "text": "Без поста",
+    },
+]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / "archive.jsonl"
+    lines = [json.dumps(row, ensure_ascii=False) for row in ROWS]
+    path.write_text("\n".join(lines[:2] + ["{broken"] + lines[2:]) + "\n")
+    return path
+
+
+def test_import_jsonl(archive):
+    out = StringIO()
+    call_command("import_jsonl", str(archive), "--batch-size", "2",
+                 stdout=out)
+    assert "строк/с" in out.getvalue()
+
+    post_ids = imported_ids("post", [501, 502])
+    post = Post.objects.select_related("author", "category").get(
+        pk=post_ids[501]
+    )
+    assert post.author.username == "archivist"
+    assert post.category.slug == "archive"
+    assert post.created_at.year == 2015, (
+        "Убедитесь, что импорт сохраняет даты создания из архива."
+    )
+    assert post.is_live
+    assert not Post.objects.get(pk=post_ids[502]).is_live
+    assert post.comment_count == 2
+    assert Comment.objects.count() == 2
+    assert search_posts("маяк") == [post.pk]
+    assert not archive.with_name("archive.jsonl.checkpoint").exists()
+
+
+def test_import_resumes_without_duplicates(archive, monkeypatch):
+    original = JsonlImporter._comment
+    calls = []
+
+    def interrupt(self, row):
+        calls.append(row["id"])
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return original(self, row)
+
+    monkeypatch.setattr(JsonlImporter, "_comment", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        JsonlImporter(archive, batch_size=1, log=lambda message: None).run()
+    assert archive.with_name("archive.jsonl.checkpoint").exists()
+
+    monkeypatch.setattr(JsonlImporter, "_comment", original)
+    JsonlImporter(archive, batch_size=1, log=lambda message: None).run()
+    JsonlImporter(archive, batch_size=1, log=lambda message: None).run()
+    assert Post.objects.count() == 2
+    assert Comment.objects.count() == 2, (
+        "Убедитесь, что повторный импорт не создаёт дубликатов."
+    )
+
+
+def test_import_does_not_touch_posts_with_same_id(
+    archive, mixer, user, published_category
+):
+    existing = mixer.blend(
+        "blog.Post", id=501, author=user, category=published_category,
+        title="Местный пост", text="Местный текст",
+    )
+    stats = JsonlImporter(archive, log=lambda message: None).run()
+    assert stats["posts"] == 2
+
+    existing.refresh_from_db()
+    assert existing.title == "Местный пост"
+    assert existing.comment_count == 0, (
+        "Убедитесь, что комментарии из архива не привязываются к посту,"
+        " у которого случайно совпал идентификатор."
+    )
+    archived = Post.objects.get(pk=imported_ids("post", [501])[501])
+    assert archived.pk != existing.pk
+    assert archived.comments.count() == 2
+    assert search_posts("маяк") == [archived.pk]
+    assert search_posts("местный") == [existing.pk]
+
+
+def test_import_skips_rows_with_missing_fields(tmp_path):
+    rows = [
+        {"type": "post", "id": 1, "title": "Без автора", "text": "Текст",
+         "author": None},
+        {"type": "post", "id": 2, "title": None, "text": "Текст",
+         "author": "archivist"},
+        {"type": "post", "id": 3, "title": "Без текста",
+         "author": "archivist"},
+        {"type": "post", "id": 4, "title": "Целый пост", "text": "Текст",
+         "author": "archivist"},
+        {"type": "comment", "id": 5, "post": 4, "author": None,
+         "text": "Без автора"},
+        {"type": "comment", "id": 6, "post": 4, "author": "reader",
+         "text": "Целый комментарий"},
+    ]
+    path = tmp_path / "archive.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+    messages = []
+
+    for _ in range(2):
+        stats = JsonlImporter(path, batch_size=10, log=messages.append).run()
+    assert stats["skipped"] == 4, (
+        "Убедитесь, что строки без автора, заголовка или текста"
+        " пропускаются, а не прерывают импорт."
+    )
+    assert stats["existing"] == 2
+    assert list(Post.objects.values_list("title", flat=True)) == [
+        "Целый пост"
+    ]
+    assert list(Comment.objects.values_list("text", flat=True)) == [
+        "Целый комментарий"
+    ]
+    assert any("author" in message for message in messages)
@@ -0,0 +1,37 @@
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+
+from blog.mail import email_queue
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_create_post_queues_confirmation(
+    user_client, user, published_category
+):
+    response = user_client.post("/posts/create/", data={
+        "title": "Пост",
+        "text": "Текст",
+        "pub_date": "2020-01-01T10:00",
+        "category": published_category.id,
+    })
+    assert response.status_code == 302
+    assert email_queue.flush(timeout=5), (
+        "Убедитесь, что очередь писем отправляет письма в фоне."
+    )
+    assert [message.to for message in mail.outbox] == [[user.email]]
+
+
+def test_email_queue_metrics():
+    before = email_queue.metrics()
+    for number in range(3):
+        email_queue.enqueue(EmailMessage(
+            subject=f"Письмо {number}", to=["reader@blogicum.ru"]
+        ))
+    assert email_queue.flush(timeout=5)
+    metrics = email_queue.metrics()
+    assert metrics["queue_depth"] == 0
+    assert metrics["sent"] - before["sent"] == 3
+    assert metrics["batches"] > before["batches"]
+    assert metrics["max_send_latency"] >= 0
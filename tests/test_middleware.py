@@ -0,0 +1,55 @@
+import logging
+import re
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_server_timing_header(user_client, post_with_published_location):
+    response = user_client.get(
+        f"/posts/{post_with_published_location.id}/"
+    )
+    header = response.get("Server-Timing", "")
+    match = re.match(
+        r'db;desc="(\d+) queries";dur=[\d.]+, total;dur=[\d.]+$', header
+    )
+    assert match, (
+        "Убедитесь, что ответ содержит заголовок Server-Timing с числом"
+        " SQL-запросов и временем в базе."
+    )
+    assert int(match.group(1)) > 0
+
+
+def test_request_log_line(client, caplog):
+    with caplog.at_level(logging.INFO, logger="blogicum.requests"):
+        client.get("/")
+    records = [
+        record for record in caplog.records
+        if record.name == "blogicum.requests"
+    ]
+    assert len(records) == 1, (
+        "Убедитесь, что на каждый запрос пишется одна строка лога."
+    )
+    record = records[0]
+    assert record.view_name == "blog:index"
+    assert record.status_code == 200
+    assert record.queries >= 0
+    assert "view=blog:index" in record.getMessage()
+
+
+def test_streamed_feed_queries_are_logged(
+    client, caplog, post_with_published_location
+):
+    with caplog.at_level(logging.INFO, logger="blogicum.requests"):
+        response = client.get("/feed/rss/")
+        assert not caplog.records
+        b"".join(response.streaming_content)
+    [record] = [
+        record for record in caplog.records
+        if record.name == "blogicum.requests"
+    ]
+    assert record.queries > 0, (
+        "Убедитесь, что запросы, выполненные при чтении потоковой ленты,"
+        " попадают в лог."
+    )
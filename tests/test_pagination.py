@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+import pytest
+from conftest import N_PER_PAGE
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Comment
+from blog.service import KeysetPaginator, get_filter_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def same_date_posts(mixer, user, published_category):
+    pub_date = timezone.now() - timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=pub_date,
+    )
+
+
+def test_keyset_walks_feed_without_gaps(same_date_posts):
+    paginator = KeysetPaginator(get_filter_posts(not_user=True), N_PER_PAGE)
+    page = paginator.get_page()
+    assert not page.has_previous()
+    seen = list(page)
+    pages = [list(page)]
+    while page.has_next():
+        page = paginator.get_page(page.next_cursor)
+        pages.append(list(page))
+        seen.extend(page)
+    assert [len(items) for items in pages] == [N_PER_PAGE, N_PER_PAGE, 5]
+    assert len({post.id for post in seen}) == len(same_date_posts), (
+        "Убедитесь, что курсорная пагинация не теряет и не дублирует посты"
+        " с одинаковой датой публикации."
+    )
+
+    previous = paginator.get_page(page.previous_cursor)
+    assert list(previous) == pages[-2]
+    first = paginator.get_page(previous.previous_cursor)
+    assert list(first) == pages[0]
+    assert not first.has_previous()
+
+
+def test_keyset_ignores_broken_cursor(same_date_posts):
+    paginator = KeysetPaginator(get_filter_posts(not_user=True), N_PER_PAGE)
+    assert list(paginator.get_page("not-a-cursor")) == list(
+        paginator.get_page()
+    )
+
+
+@override_settings(BLOG_KEYSET_PAGINATION=True)
+def test_feed_uses_cursor_links(client, same_date_posts):
+    response = client.get("/")
+    page_obj = response.context["page_obj"]
+    assert len(page_obj) == N_PER_PAGE
+    assert f"?cursor={page_obj.next_cursor}" in response.content.decode()
+
+    response = client.get(f"/?cursor={page_obj.next_cursor}")
+    next_ids = {post.id for post in response.context["page_obj"]}
+    assert not next_ids & {post.id for post in page_obj}
+
+
+def test_post_comments_load_by_cursor(
+    monkeypatch, mixer, user, user_client, post_with_published_location
+):
+    monkeypatch.setattr("blog.service.COMMENTS_PER_PAGE", 3)
+    post = post_with_published_location
+    created_at = timezone.now() - timedelta(hours=1)
+    comments = mixer.cycle(7).blend("blog.Comment", post=post, author=user)
+    Comment.objects.update(created_at=created_at)
+
+    response = user_client.get(f"/posts/{post.id}/")
+    page = response.context["comments"]
+    assert len(page) == 3, (
+        "Убедитесь, что на странице поста выводится ограниченное число"
+        " комментариев."
+    )
+    assert page.has_next()
+
+    seen = list(page)
+    while page.has_next():
+        response = user_client.get(
+            f"/posts/{post.id}/comments/?cursor={page.next_cursor}"
+        )
+        assert response.status_code == 200
+        page = response.context["comments"]
+        seen.extend(page)
+    assert [comment.id for comment in seen] == sorted(
+        comment.id for comment in comments
+    ), (
+        "Убедитесь, что подгрузка комментариев по курсору не теряет и не"
+        " дублирует комментарии."
+    )
+    assert b"data-load-comments" not in response.content
+
+
+def test_post_comments_hidden_for_unpublished_post(
+    another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+from blog.service import get_filter_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+def live_of(post):
+    return Post.objects.values_list("is_live", flat=True).get(pk=post.pk)
+
+
+def test_is_live_follows_publication(post_with_published_location):
+    post = post_with_published_location
+    assert live_of(post)
+
+    post.is_published = False
+    post.save(update_fields=["is_published"])
+    assert not live_of(post), (
+        "Убедитесь, что снятый с публикации пост пропадает из лент."
+    )
+
+    post.is_published = True
+    post.pub_date = timezone.now() + timedelta(days=1)
+    post.save()
+    assert not live_of(post), (
+        "Убедитесь, что отложенный пост не виден в лентах до даты"
+        " публикации."
+    )
+
+
+def test_publish_scheduled_command(
+    monkeypatch, mixer, user, published_category
+):
+    now = timezone.now()
+    due, future = [
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            pub_date=now + timedelta(hours=hours),
+        )
+        for hours in (1, 3)
+    ]
+    unpublished = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=now + timedelta(hours=1), is_published=False,
+    )
+
+    monkeypatch.setattr(timezone, "now", lambda: now + timedelta(hours=2))
+    call_command("publish_scheduled", stdout=StringIO())
+    assert live_of(due), (
+        "Убедитесь, что команда publish_scheduled публикует посты, дата"
+        " публикации которых наступила."
+    )
+    assert not live_of(future)
+    assert not live_of(unpublished)
+
+
+def test_feed_query_does_not_depend_on_time(monkeypatch):
+    sql = str(get_filter_posts(not_user=True).query)
+    monkeypatch.setattr(
+        timezone, "now", lambda: datetime(2030, 1, 1, tzinfo=dt_timezone.utc)
+    )
+    assert str(get_filter_posts(not_user=True).query) == sql, (
+        "Убедитесь, что запрос ленты не зависит от текущего времени."
+    )
+
+
+def test_due_post_page_is_visible_before_scheduler(
+    monkeypatch, mixer, user, another_user_client, published_category
+):
+    now = timezone.now()
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=now + timedelta(hours=1),
+    )
+    assert another_user_client.get(f"/posts/{post.id}/").status_code == 404
+
+    monkeypatch.setattr(timezone, "now", lambda: now + timedelta(hours=2))
+    response = another_user_client.get(f"/posts/{post.id}/")
+    assert response.status_code == 200, (
+        "Убедитесь, что пост открывается, как только наступила дата его"
+        " публикации."
+    )
+    assert not live_of(post), (
+        "Убедитесь, что GET-запрос не публикует посты: это делает"
+        " планировщик."
+    )
@@ -0,0 +1,43 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+POST_DETAIL_QUERY_BUDGET = 4
+
+
+def detail_queries(client, post):
+    # Первый запрос после изменения контента один раз ищет ближайшую
+    # отложенную публикацию; бюджет считается для следующих запросов.
+    client.get(f"/posts/{post.id}/")
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == 200
+    return len(queries)
+
+
+def test_post_detail_query_budget(
+    mixer, user_client, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend(Comment, post=post, author=another_user)
+    few = detail_queries(user_client, post)
+
+    mixer.cycle(10).blend(
+        Comment, post=post, author=mixer.sequence(
+            *mixer.cycle(10).blend("auth.User")
+        )
+    )
+    many = detail_queries(user_client, post)
+
+    assert few == many, (
+        "Убедитесь, что число запросов страницы поста не зависит от числа"
+        " комментариев."
+    )
+    assert many <= POST_DETAIL_QUERY_BUDGET, (
+        f"Страница поста выполняет {many} запросов, ожидалось не больше"
+        f" {POST_DETAIL_QUERY_BUDGET}."
+    )
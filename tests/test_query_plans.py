@@ -0,0 +1,22 @@
+import pytest
+from django.db import connection
+
+from blog.checks import check_feed_query_plans, slow_plan_steps
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="Проверка планов только для SQLite"
+)
+def test_feed_queries_use_indexes():
+    errors = check_feed_query_plans(None, databases=["default"])
+    assert not errors, "\n".join(error.msg for error in errors)
+
+
+def test_slow_plan_steps_detects_full_scan():
+    plan = "2 0 0 SCAN blog_post\n40 0 0 USE TEMP B-TREE FOR ORDER BY"
+    assert len(slow_plan_steps(plan)) == 2
+    assert not slow_plan_steps(
+        "8 0 0 SEARCH blog_post USING INDEX post_feed_idx (pub_date<?)"
+    )
@@ -0,0 +1,157 @@
+import sqlite3
+from datetime import timedelta
+
+import pytest
+from django.db import connections
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from django.utils import timezone
+
+from blog.cache import bump_content_version
+from blog.models import Post
+from blog.publication import publish_due_posts
+from core.middleware import PIN_COOKIE, ReplicaPinMiddleware
+from core.routers import PrimaryReplicaRouter, is_pinned, pin_to_primary
+
+
+@pytest.fixture
+def replicas(settings, monkeypatch):
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.REPLICA_PIN_SECONDS = 7
+    monkeypatch.setattr(connections["default"], "in_atomic_block", False)
+
+
+def test_router_without_replicas(settings):
+    settings.DATABASE_REPLICAS = []
+    router = PrimaryReplicaRouter()
+    assert router.db_for_read(Post) == "default"
+    assert router.db_for_write(Post) == "default"
+
+
+def test_router_reads_from_replica(replicas, monkeypatch):
+    router = PrimaryReplicaRouter()
+    assert router.db_for_read(Post) == "replica"
+    assert router.db_for_write(Post) == "default"
+    assert router.allow_migrate("replica", "blog") is False
+
+    with pin_to_primary():
+        assert router.db_for_read(Post) == "default"
+    assert router.db_for_read(Post) == "replica"
+
+    monkeypatch.setattr(connections["default"], "in_atomic_block", True)
+    assert router.db_for_read(Post) == "default", (
+        "Убедитесь, что внутри транзакции чтение идёт в основную базу."
+    )
+
+
+def pinned_view(request):
+    return HttpResponse(str(is_pinned()))
+
+
+def test_writes_pin_reads_to_primary(replicas):
+    middleware = ReplicaPinMiddleware(pinned_view)
+    factory = RequestFactory()
+
+    assert middleware(factory.get("/")).content == b"False"
+
+    response = middleware(factory.post("/posts/create/"))
+    assert response.content == b"True"
+    assert response.cookies[PIN_COOKIE]["max-age"] == 7
+
+    request = factory.get("/")
+    request.COOKIES[PIN_COOKIE] = "1"
+    assert middleware(request).content == b"True", (
+        "Убедитесь, что после записи чтения пользователя закреплены за "
+        "основной базой."
+    )
+    assert not is_pinned()
+
+
+def test_no_pin_cookie_without_replicas(settings):
+    settings.DATABASE_REPLICAS = []
+    response = ReplicaPinMiddleware(pinned_view)(
+        RequestFactory().post("/posts/create/")
+    )
+    assert PIN_COOKIE not in response.cookies
+
+
+@pytest.mark.django_db
+def test_only_shared_writes_pin_everyone(
+    replicas, mixer, user, published_category
+):
+    middleware = ReplicaPinMiddleware(pinned_view)
+    bump_content_version()
+    assert middleware(RequestFactory().get("/")).content == b"False", (
+        "Убедитесь, что обычная правка не закрепляет за основной базой"
+        " чтения всех пользователей."
+    )
+
+    with pin_to_primary():
+        post = mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            pub_date=timezone.now() + timedelta(hours=1),
+        )
+        Post.objects.filter(pk=post.pk).update(pub_date=timezone.now())
+        assert publish_due_posts() == 1
+    assert middleware(RequestFactory().get("/")).content == b"True", (
+        "Убедитесь, что сразу после отложенной публикации страницы для"
+        " общего кеша читаются из основной базы."
+    )
+
+
+def test_streamed_response_stays_pinned(replicas):
+    def streaming_view(request):
+        return StreamingHttpResponse(str(is_pinned()) for _ in range(1))
+
+    request = RequestFactory().get("/feed/rss/")
+    request.COOKIES[PIN_COOKIE] = "1"
+    response = ReplicaPinMiddleware(streaming_view)(request)
+    assert b"".join(response.streaming_content) == b"True", (
+        "Убедитесь, что чтения потоковой ленты тоже идут в основную базу."
+    )
+
+
+@pytest.fixture
+def sqlite_replica(tmp_path, settings, transactional_db):
+    """Вторая база SQLite в файле; sync() копирует в неё основную."""
+    connections.databases["replica"] = {
+        **connections.databases["default"],
+        "NAME": str(tmp_path / "replica.sqlite3"),
+    }
+
+    def sync():
+        connections["default"].ensure_connection()
+        replica = sqlite3.connect(connections.databases["replica"]["NAME"])
+        connections["default"].connection.backup(replica)
+        replica.close()
+
+    yield sync
+    connections["replica"].close()
+    del connections["replica"]
+    del connections.databases["replica"]
+
+
+def test_stale_replica_is_read_only_when_unpinned(
+    sqlite_replica, settings, mixer, user
+):
+    post = mixer.blend("blog.Post", author=user, title="Старое название")
+    sqlite_replica()
+    settings.DATABASE_REPLICAS = ["replica"]
+    Post.objects.filter(pk=post.pk).update(title="Новое название")
+
+    middleware = ReplicaPinMiddleware(
+        lambda request: HttpResponse(Post.objects.get(pk=post.pk).title)
+    )
+    factory = RequestFactory()
+    assert middleware(factory.get("/")).content.decode() == (
+        "Старое название"
+    ), "Убедитесь, что без закрепления чтение идёт из реплики."
+
+    request = factory.get("/")
+    request.COOKIES[PIN_COOKIE] = "1"
+    assert middleware(request).content.decode() == "Новое название", (
+        "Убедитесь, что закреплённый пользователь читает из основной базы,"
+        " а не из отстающей реплики."
+    )
+    response = middleware(factory.post("/"))
+    assert response.content.decode() == "Новое название"
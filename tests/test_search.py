@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.search import search_available
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        not search_available(), reason="Полнотекстовый поиск только в SQLite"
+    ),
+]
+
+
+def found_titles(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+    return [post.title for post in response.context["page_obj"]]
+
+
+def test_search_ranks_and_respects_visibility(
+    client, mixer, user, published_category
+):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Про котов", text="Текст без ключевого слова",
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Заметка", text="Немного о котов и собаках",
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Скрытые котов", is_published=False,
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Будущие котов", pub_date=timezone.now() + timedelta(days=1),
+    )
+    assert found_titles(client, "котов") == ["Про котов", "Заметка"], (
+        "Убедитесь, что поиск находит только видимые посты и ставит"
+        " совпадения в заголовке выше."
+    )
+
+
+def test_search_index_follows_edits_and_deletes(
+    client, post_with_published_location
+):
+    post = post_with_published_location
+    post.title = "Уникальный заголовок"
+    post.save()
+    assert found_titles(client, "Уникальный") == ["Уникальный заголовок"]
+
+    post.delete()
+    assert found_titles(client, "Уникальный") == []
+
+
+def test_search_tolerates_fts_syntax(client):
+    assert found_titles(client, 'AND "(* NEAR') == []
@@ -0,0 +1,63 @@
+import re
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.sitemaps import build_sitemaps
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def sitemap_root(settings, tmp_path):
+    settings.BLOG_SITEMAP_ROOT = tmp_path
+    settings.BLOG_SITE_URL = "https://blogicum.test"
+    return tmp_path
+
+
+def locations(path):
+    return re.findall(r"<loc>([^<]+)</loc>", path.read_text())
+
+
+def test_sitemaps_are_chunked_and_complete(
+    sitemap_root, mixer, user, published_category,
+    posts_with_unpublished_category, future_posts
+):
+    posts = mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    files = build_sitemaps(chunk_size=2, per_file=2)
+    assert files["posts"] == [
+        "sitemap-posts-1.xml", "sitemap-posts-2.xml", "sitemap-posts-3.xml"
+    ], "Убедитесь, что посты разбиваются на файлы карты сайта."
+
+    urls = [
+        url for name in files["posts"]
+        for url in locations(sitemap_root / name)
+    ]
+    assert sorted(urls) == sorted(
+        f"https://blogicum.test/posts/{post.id}/" for post in posts
+    ), (
+        "Убедитесь, что в карту сайта попадают все видимые посты и только"
+        " они."
+    )
+    index = locations(sitemap_root / "sitemap.xml")
+    assert "https://blogicum.test/sitemaps/sitemap-posts-3.xml" in index
+
+    build_sitemaps(chunk_size=2, per_file=10)
+    assert not (sitemap_root / "sitemap-posts-2.xml").exists(), (
+        "Убедитесь, что файлы прошлой генерации удаляются."
+    )
+
+
+def test_sitemap_views(client, sitemap_root, post_with_published_location):
+    assert client.get("/sitemap.xml").status_code == 404
+    call_command("build_sitemaps", stdout=StringIO())
+
+    response = client.get("/sitemap.xml")
+    assert response.status_code == 200
+    section = client.get("/sitemaps/sitemap-posts-1.xml")
+    body = b"".join(section.streaming_content).decode()
+    assert f"/posts/{post_with_published_location.id}/" in body
+    assert client.get("/sitemaps/..%2Fsettings.py").status_code == 404